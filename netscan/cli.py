@@ -78,7 +78,7 @@ def parse_args(argv: List[str]) -> argparse.Namespace:
         "--output-csv",
         type=str,
         metavar="FILE",
-        help="Export results to CSV file",
+        help="Export results to CSV file (gzip-compressed if FILE ends in .gz)",
     )
     parser.add_argument(
         "--output-md",
@@ -220,7 +220,8 @@ def main(argv: List[str] | None = None) -> int:
     # Export to CSV if requested
     if ns.output_csv:
         try:
-            output_path = export_to_csv(results, ns.output_csv, include_down=ns.include_down)
+            output_path = export_to_csv(results, ns.output_csv, include_down=ns.include_down,
+                                        compress=ns.output_csv.endswith(".gz"))
             color_on = supports_color() and not ns.no_color
             print(paint(f"✅ CSV exported to: {output_path}", Color.GREEN, Color.BOLD, enable=color_on))
         except Exception as e:
@@ -8,13 +8,74 @@ Supports multiple output formats:
 - HTML: Interactive HTML report (planned)
 """
 
-import csv
+import gzip
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence
 from dataclasses import dataclass
 
 
+# Output buffer for exported files; large scans produce many small writes
+WRITE_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+# CSV dialect shared by all CSV output (same as csv.writer's defaults)
+_CSV_LINE_END = "\r\n"
+_CSV_HEADER = "IP Address,Status,Latency (ms),Hostname,MAC Address,Vendor,Open Ports" + _CSV_LINE_END
+# Characters that force a field to be quoted (csv.QUOTE_MINIMAL rules)
+_CSV_NEEDS_QUOTE = frozenset(',"\r\n')
+# Rows formatted in memory before each write to the output file
+_CSV_CHUNK_ROWS = 10000
+
+
+def _csv_field(value: str) -> str:
+    """Quote a CSV field only if it contains a delimiter, quote or line break."""
+    if _CSV_NEEDS_QUOTE.isdisjoint(value):
+        return value
+    return '"' + value.replace('"', '""') + '"'
+
+
+def _join_port_ranges(ports: Sequence[int]) -> str:
+    """
+    Format sorted ports with ranges for compact display.
+    
+    Shared by all exporters. Example: [22, 23, 24, 25, 80, 443] -> "22-25, 80, 443"
+    
+    Args:
+        ports: Sorted sequence of port numbers
+        
+    Returns:
+        Formatted string with ranges
+    """
+    if not ports:
+        return ""
+    
+    ranges = []
+    start = end = ports[0]
+    
+    for port in ports[1:]:
+        if port == end + 1:
+            end = port
+            continue
+        # Add completed range
+        if start == end:
+            ranges.append(str(start))
+        elif end == start + 1:
+            ranges.append(f"{start}, {end}")
+        else:
+            ranges.append(f"{start}-{end}")
+        start = end = port
+    
+    # Add final range
+    if start == end:
+        ranges.append(str(start))
+    elif end == start + 1:
+        ranges.append(f"{start}, {end}")
+    else:
+        ranges.append(f"{start}-{end}")
+    
+    return ", ".join(ranges)
+
+
 @dataclass
 class HostData:
     """Represents a scanned host with all its data."""
@@ -62,16 +123,18 @@ class Exporter:
 class CSVExporter(Exporter):
     """Export scan results to CSV format."""
     
-    def __init__(self, filepath: str, include_down: bool = False):
+    def __init__(self, filepath: str, include_down: bool = False, compress: bool = False):
         """
         Initialize CSV exporter.
         
         Args:
             filepath: Path to output CSV file
             include_down: Include hosts that are DOWN
+            compress: Write gzip-compressed output (e.g. for .csv.gz files)
         """
         super().__init__(filepath)
         self.include_down = include_down
+        self.compress = compress
     
     def export(self, hosts: List[HostData]) -> None:
         """
@@ -85,34 +148,40 @@ class CSVExporter(Exporter):
         """
         self._ensure_directory()
         
-        # Filter hosts if needed
-        filtered_hosts = hosts if self.include_down else [h for h in hosts if h.status == "UP"]
+        # Filter hosts lazily; with include_down the input is used as-is
+        filtered_hosts = hosts if self.include_down else (h for h in hosts if h.status == "UP")
         
-        with open(self.filepath, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.writer(csvfile, quoting=csv.QUOTE_MINIMAL)
-            
-            # Write header
-            writer.writerow([
-                'IP Address',
-                'Status',
-                'Latency (ms)',
-                'Hostname',
-                'MAC Address',
-                'Vendor',
-                'Open Ports'
-            ])
-            
-            # Write data rows
+        # Build rows directly instead of going through csv.writer: IP, status,
+        # latency and MAC never need quoting, so only free-text fields are checked.
+        # Rows are written in chunks so large scans don't hold the whole file in memory.
+        with self._open_output() as csvfile:
+            chunk = [_CSV_HEADER]
             for host in filtered_hosts:
-                writer.writerow([
-                    host.ip,
-                    host.status,
-                    f"{host.latency:.2f}" if host.latency is not None else "",
-                    host.hostname or "",
-                    host.mac or "",
-                    self._escape_vendor(host.vendor or ""),
-                    self._format_ports(host.ports)
-                ])
+                latency = f"{host.latency:.2f}" if host.latency is not None else ""
+                chunk.append(
+                    f"{host.ip},{host.status},{latency},"
+                    f"{_csv_field(host.hostname or '')},{host.mac or ''},"
+                    f"{_csv_field(self._escape_vendor(host.vendor or ''))},"
+                    f"{_csv_field(self._format_ports(host.ports))}{_CSV_LINE_END}"
+                )
+                if len(chunk) >= _CSV_CHUNK_ROWS:
+                    csvfile.write("".join(chunk))
+                    chunk.clear()
+            csvfile.write("".join(chunk))
+    
+    def _open_output(self):
+        """
+        Open the output file for writing.
+        
+        Compressed output uses the fastest gzip level; plain output
+        gets a large write buffer to cut down on write() syscalls.
+        
+        Returns:
+            Writable text file object
+        """
+        if self.compress:
+            return gzip.open(self.filepath, 'wt', compresslevel=1, newline='', encoding='utf-8')
+        return open(self.filepath, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
     
     def _escape_vendor(self, vendor: str) -> str:
         """
@@ -128,7 +197,7 @@ class CSVExporter(Exporter):
         """
         if not vendor:
             return ""
-        # CSV writer handles escaping automatically, but we clean up
+        # Quoting is applied when the row is written, here we only clean up
         return vendor.strip()
     
     def _format_ports(self, ports: Optional[List[int]]) -> str:
@@ -162,38 +231,11 @@ class CSVExporter(Exporter):
         Returns:
             Formatted string with ranges
         """
-        if not ports:
-            return ""
-        
-        ranges = []
-        start = ports[0]
-        end = ports[0]
-        
-        for port in ports[1:]:
-            if port == end + 1:
-                end = port
-            else:
-                # Add completed range
-                if start == end:
-                    ranges.append(str(start))
-                elif end == start + 1:
-                    ranges.append(f"{start}, {end}")
-                else:
-                    ranges.append(f"{start}-{end}")
-                start = end = port
-        
-        # Add final range
-        if start == end:
-            ranges.append(str(start))
-        elif end == start + 1:
-            ranges.append(f"{start}, {end}")
-        else:
-            ranges.append(f"{start}-{end}")
-        
-        return ", ".join(ranges)
+        return _join_port_ranges(ports)
 
 
-def export_to_csv(hosts: List[Dict[str, Any]], filepath: str, include_down: bool = False) -> None:
+def export_to_csv(hosts: List[Dict[str, Any]], filepath: str, include_down: bool = False,
+                  compress: bool = False) -> None:
     """
     Convenience function to export hosts to CSV.
     
@@ -201,6 +243,7 @@ def export_to_csv(hosts: List[Dict[str, Any]], filepath: str, include_down: bool
         hosts: List of host dictionaries (from scanner)
         filepath: Output file path
         include_down: Include DOWN hosts
+        compress: Write gzip-compressed CSV
     """
     # Convert dict format to HostData
     host_data = []
@@ -215,7 +258,7 @@ def export_to_csv(hosts: List[Dict[str, Any]], filepath: str, include_down: bool
             ports=h.get('ports', [])
         ))
     
-    exporter = CSVExporter(filepath, include_down=include_down)
+    exporter = CSVExporter(filepath, include_down=include_down, compress=compress)
     exporter.export(host_data)
     
     return str(exporter.filepath)
@@ -363,35 +406,7 @@ class MarkdownExporter(Exporter):
         Returns:
             Formatted string with ranges
         """
-        if not ports:
-            return ""
-        
-        ranges = []
-        start = ports[0]
-        end = ports[0]
-        
-        for port in ports[1:]:
-            if port == end + 1:
-                end = port
-            else:
-                # Add completed range
-                if start == end:
-                    ranges.append(str(start))
-                elif end == start + 1:
-                    ranges.append(f"{start}, {end}")
-                else:
-                    ranges.append(f"{start}-{end}")
-                start = end = port
-        
-        # Add final range
-        if start == end:
-            ranges.append(str(start))
-        elif end == start + 1:
-            ranges.append(f"{start}, {end}")
-        else:
-            ranges.append(f"{start}-{end}")
-        
-        return ", ".join(ranges)
+        return _join_port_ranges(ports)
 
 
 def export_to_markdown(hosts: List[Dict[str, Any]], filepath: str, 
@@ -579,33 +594,7 @@ class HTMLExporter(Exporter):
         """Format port list into compact ranges (e.g., '22-25, 80, 443')."""
         if not ports:
             return ""
-        
-        sorted_ports = sorted(set(ports))
-        ranges = []
-        start = sorted_ports[0]
-        end = sorted_ports[0]
-        
-        for port in sorted_ports[1:]:
-            if port == end + 1:
-                end = port
-            else:
-                if end == start:
-                    ranges.append(str(start))
-                elif end == start + 1:
-                    ranges.append(f"{start}, {end}")
-                else:
-                    ranges.append(f"{start}-{end}")
-                start = end = port
-        
-        # Handle last range
-        if end == start:
-            ranges.append(str(start))
-        elif end == start + 1:
-            ranges.append(f"{start}, {end}")
-        else:
-            ranges.append(f"{start}-{end}")
-        
-        return ", ".join(ranges)
+        return _join_port_ranges(sorted(set(ports)))
     
     def _escape_html(self, text: str) -> str:
         """Escape HTML special characters."""
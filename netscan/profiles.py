@@ -8,7 +8,7 @@ performance/stealth characteristics.
 import os
 import yaml
 from dataclasses import dataclass, asdict
-from typing import Dict, List, Optional
+from typing import Dict, Optional, Sequence
 from pathlib import Path
 
 
@@ -102,7 +102,8 @@ TOP_100_PORTS = [
     8001, 8009, 8081, 8082, 8180, 8888, 9000, 9001, 9080, 9090,
 ]
 
-TOP_1000_PORTS = list(range(1, 1001))  # Simplified for now
+# Tuple so callers can't mutate the shared list returned by get_ports_from_range
+TOP_1000_PORTS = tuple(range(1, 1001))  # Simplified for now
 
 
 def get_profile(name: str) -> Optional[ScanProfile]:
@@ -260,15 +261,15 @@ def get_profile_directory() -> Path:
     return Path.home() / '.netscan' / 'profiles'
 
 
-def get_ports_from_range(port_range: str) -> List[int]:
+def get_ports_from_range(port_range: str) -> Sequence[int]:
     """
-    Convert port range string to list of ports.
+    Convert port range string to a sequence of ports.
     
     Args:
         port_range: Port range string (e.g., "1-100", "top100", "top1000")
         
     Returns:
-        List of port numbers
+        Sequence of port numbers (treat as read-only)
     """
     if port_range == 'top100':
         return TOP_100_PORTS
@@ -278,14 +279,14 @@ def get_ports_from_range(port_range: str) -> List[int]:
         # Parse range like "1-100"
         try:
             start, end = port_range.split('-')
-            return list(range(int(start), int(end) + 1))
+            return range(int(start), int(end) + 1)
         except ValueError:
             print(f"Invalid port range: {port_range}")
-            return list(range(1, 1001))  # Default to top 1000
+            return TOP_1000_PORTS  # Default to top 1000
     else:
         # Single port
         try:
             return [int(port_range)]
         except ValueError:
             print(f"Invalid port specification: {port_range}")
-            return list(range(1, 1001))  # Default to top 1000
+            return TOP_1000_PORTS  # Default to top 1000
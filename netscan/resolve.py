@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import ipaddress
 import platform
 import socket
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -8,6 +9,25 @@ import subprocess
 import re
 
 
+# Compiled once; the fallbacks below run these per unresolved IP
+_WS_RE = re.compile(r"\s+")
+# Example snippet often includes: "Add     2   4   <qname>.   PTR   <hostname>."
+_DNSSD_PTR_RE = re.compile(r"PTR\s+([A-Za-z0-9_.-]+)\.?\s*$", re.MULTILINE)
+_HOST_PTR_RE = re.compile(r"pointer\s+([^\s]+)\.?$", re.IGNORECASE)
+
+
+def _rev_arpa(ip: str) -> str:
+    try:
+        return ipaddress.ip_address(ip).reverse_pointer
+    except ValueError:
+        return ip
+
+
+def _ascii(out: Optional[bytes]) -> str:
+    # DNS names are ASCII; skip the locale codec lookup that text=True does
+    return out.decode("ascii", "replace") if out else ""
+
+
 def _ptr(ip: str) -> Optional[str]:
     try:
         name, _, _ = socket.gethostbyaddr(ip)
@@ -36,10 +56,10 @@ def resolve_ptrs(ips: Iterable[str], concurrency: int = 32, timeout_per_lookup:
     if unresolved:
         # 1) Linux: avahi-resolve-address (mDNS)
         try:
-            p = subprocess.run(["avahi-resolve-address"] + unresolved, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, check=False, timeout=1.5)
-            out = p.stdout or ""
+            p = subprocess.run(["avahi-resolve-address"] + unresolved, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=False, timeout=1.5)
+            out = _ascii(p.stdout)
             for line in out.splitlines():
-                parts = re.split(r"\s+", line.strip())
+                parts = _WS_RE.split(line.strip())
                 if len(parts) >= 2:
                     ip, host = parts[0], parts[1]
                     if ip in res and res[ip] is None:
@@ -49,21 +69,15 @@ def resolve_ptrs(ips: Iterable[str], concurrency: int = 32, timeout_per_lookup:
 
         # 2) macOS: dns-sd reverse PTR query per IP
         if platform.system().lower() == "darwin":
-            def _rev_arpa(ip: str) -> str:
-                parts = ip.split(".")
-                if len(parts) == 4:
-                    return f"{parts[3]}.{parts[2]}.{parts[1]}.{parts[0]}.in-addr.arpa"
-                return ip
             for ip in list(unresolved):
                 if res.get(ip):
                     continue
                 try:
                     qname = _rev_arpa(ip)
-                    p = subprocess.run(["dns-sd", "-Q", qname, "PTR"], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, check=False, timeout=1.5)
-                    out = p.stdout or ""
+                    p = subprocess.run(["dns-sd", "-Q", qname, "PTR"], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, check=False, timeout=1.5)
+                    out = _ascii(p.stdout)
                     # Look for lines that contain the queried name and a hostname ending with a dot
-                    # Example snippet often includes: "Add     2   4   <qname>.   PTR   <hostname>."
-                    m = re.search(r"PTR\s+([A-Za-z0-9_.-]+)\.?\s*$", out, re.MULTILINE)
+                    m = _DNSSD_PTR_RE.search(out)
                     if m:
                         host = m.group(1).rstrip('.')
                         if host and res.get(ip) is None:
@@ -77,9 +91,9 @@ def resolve_ptrs(ips: Iterable[str], concurrency: int = 32, timeout_per_lookup:
             # Try `host -W 1 <ip>` (if available)
             for ip in list(still):
                 try:
-                    p = subprocess.run(["host", "-W", "1", ip], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, check=False, timeout=1.5)
-                    out = (p.stdout or "").strip()
-                    m = re.search(r"pointer\s+([^\s]+)\.?$", out, re.IGNORECASE)
+                    p = subprocess.run(["host", "-W", "1", ip], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, check=False, timeout=1.5)
+                    out = _ascii(p.stdout).strip()
+                    m = _HOST_PTR_RE.search(out)
                     if m:
                         name = m.group(1).rstrip('.')
                         if name:
@@ -91,8 +105,8 @@ def resolve_ptrs(ips: Iterable[str], concurrency: int = 32, timeout_per_lookup:
             still2 = [ip for ip in still if res.get(ip) is None]
             for ip in list(still2):
                 try:
-                    p = subprocess.run(["dig", "-x", ip, "+short", "+time=1"], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, check=False, timeout=1.5)
-                    out = (p.stdout or "").strip()
+                    p = subprocess.run(["dig", "-x", ip, "+short", "+time=1"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=False, timeout=1.5)
+                    out = _ascii(p.stdout).strip()
                     cand = next((ln.strip().rstrip('.') for ln in out.splitlines() if ln.strip()), None)
                     if cand:
                         res[ip] = cand
@@ -1,15 +1,33 @@
 from __future__ import annotations
 
+import errno
+import functools
 import ipaddress
+import itertools
 import os
 import platform
 import re
+import resource
+import selectors
+import shutil
 import subprocess
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 import socket
+import struct
 import time
 from dataclasses import dataclass
-from typing import Generator, List, Optional, Iterable
+from typing import Callable, Deque, Dict, Generator, List, Optional, Iterable, Iterator, Tuple
+
+__all__ = [
+    "PingResult",
+    "IcmpSweeper",
+    "ping",
+    "expand_targets",
+    "scan_cidr",
+    "port_scan",
+]
 
 
 @dataclass(frozen=True)
@@ -22,13 +40,24 @@ class PingResult:
         return {"ip": self.ip, "up": self.up, "latency_ms": self.latency_ms}
 
 
+@functools.lru_cache(maxsize=None)
+def _ping_binary(default: str) -> str:
+    # An absolute path (plus close_fds=False) lets subprocess use posix_spawn
+    # instead of fork+exec, which would copy this process' page tables per ping
+    if os.path.exists(default):
+        return default
+    return shutil.which("ping") or "ping"
+
+
 def _build_ping_cmd(ip: str, count: int, timeout: float) -> List[str]:
     system = platform.system().lower()
     if system == "darwin":
         # macOS BSD ping uses -W in milliseconds
         ms = max(1, int(timeout * 1000))
         return [
-            "/sbin/ping" if os.path.exists("/sbin/ping") else "ping",
+            _ping_binary("/sbin/ping"),
+            "-q",
+            "-n",
             "-c",
             str(count),
             "-W",
@@ -36,10 +65,12 @@ def _build_ping_cmd(ip: str, count: int, timeout: float) -> List[str]:
             ip,
         ]
     else:
-        # Linux ping uses -W in seconds for per-packet timeout
+        # Linux ping uses -W in seconds for per-packet timeout; no -n, which
+        # busybox ping rejects (targets are literal IPs, so it is moot)
         sec = max(1, int(round(timeout)))
         return [
-            "/bin/ping" if os.path.exists("/bin/ping") else "ping",
+            _ping_binary("/bin/ping"),
+            "-q",
             "-c",
             str(count),
             "-W",
@@ -48,7 +79,242 @@ def _build_ping_cmd(ip: str, count: int, timeout: float) -> List[str]:
         ]
 
 
+_ICMP_ECHO_REPLY = 0
+_ICMP_ECHO_REQUEST = 8
+_ICMP_PAYLOAD = b"netscan".ljust(56, b"\0")  # same size as the system ping
+_icmp_available: Optional[bool] = None  # probed once on first ping()
+_icmp_ident = itertools.count(os.getpid())  # distinct echo identifier per ping() call
+
+
+def _icmp_checksum(data: bytes) -> int:
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def _icmp_echo_packet(ident: int, seq: int) -> bytes:
+    header = struct.pack("!BBHHH", _ICMP_ECHO_REQUEST, 0, 0, ident, seq)
+    csum = _icmp_checksum(header + _ICMP_PAYLOAD)
+    return struct.pack("!BBHHH", _ICMP_ECHO_REQUEST, 0, csum, ident, seq) + _ICMP_PAYLOAD
+
+
+def _parse_echo_reply(data: bytes) -> Optional[Tuple[int, int]]:
+    """Return (identifier, sequence) of an ICMP echo reply, else None."""
+    # Raw sockets (and datagram sockets on macOS) deliver the IPv4 header too
+    if len(data) >= 20 and data[0] >> 4 == 4:
+        data = data[(data[0] & 0x0F) * 4:]
+    if len(data) < 8 or data[0] != _ICMP_ECHO_REPLY:
+        return None
+    _, _, _, ident, seq = struct.unpack("!BBHHH", data[:8])
+    return ident, seq
+
+
+def _open_icmp_socket() -> Optional[socket.socket]:
+    """Open an ICMP socket without spawning a process.
+
+    Prefers the unprivileged datagram ICMP socket (macOS, Linux with
+    net.ipv4.ping_group_range), falls back to a raw socket when running
+    with CAP_NET_RAW/root. Returns None if neither is permitted.
+    """
+    for kind in (socket.SOCK_DGRAM, socket.SOCK_RAW):
+        try:
+            return socket.socket(socket.AF_INET, kind, socket.IPPROTO_ICMP)
+        except OSError:
+            continue
+    return None
+
+
+def _icmp_supported() -> bool:
+    global _icmp_available
+    if _icmp_available is None:
+        s = _open_icmp_socket()
+        _icmp_available = s is not None
+        if s is not None:
+            s.close()
+    return _icmp_available
+
+
+def _ping_icmp(ip: str, count: int, timeout: float) -> PingResult:
+    sock = _open_icmp_socket()
+    if sock is None:
+        raise OSError("ICMP socket not permitted")
+    rtts: List[float] = []
+    with sock:
+        # Datagram sockets get their identifier rewritten by the kernel on Linux,
+        # so only raw sockets can filter on it; sequence + source work for both.
+        raw = sock.type == socket.SOCK_RAW
+        ident = next(_icmp_ident) & 0xFFFF
+        for seq in range(count):
+            t0 = time.perf_counter()
+            sock.sendto(_icmp_echo_packet(ident, seq), (ip, 0))
+            deadline = t0 + timeout
+            while True:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                sock.settimeout(remaining)
+                try:
+                    data, addr = sock.recvfrom(1024)
+                except socket.timeout:
+                    break
+                reply = _parse_echo_reply(data)
+                if addr[0] != ip or reply is None or reply[1] != seq or (raw and reply[0] != ident):
+                    continue
+                rtts.append((time.perf_counter() - t0) * 1000.0)
+                break
+    if not rtts:
+        return PingResult(ip=ip, up=False, latency_ms=None)
+    return PingResult(ip=ip, up=True, latency_ms=sum(rtts) / len(rtts))
+
+
+class IcmpSweeper:
+    """Ping many hosts from a single ICMP socket (fping-style).
+
+    Echo requests go out back-to-back with distinct sequence numbers while a
+    single selector loop (epoll/kqueue) drains the replies, so a sweep needs
+    no thread or socket per host. At most ``window`` requests are in flight.
+    """
+
+    def __init__(self, timeout: float = 1.0, count: int = 1, window: int = 128) -> None:
+        self.timeout = timeout
+        self.count = max(1, count)
+        self.window = max(1, window)
+
+    def sweep(self, hosts: Iterable[str]) -> Generator[PingResult, None, None]:
+        """Yield one PingResult per host, in completion order."""
+        sock = _open_icmp_socket()
+        if sock is None:
+            raise OSError("ICMP socket not permitted")
+        sock.setblocking(False)
+        raw = sock.type == socket.SOCK_RAW
+        ident = next(_icmp_ident) & 0xFFFF
+        sel = selectors.DefaultSelector()
+        sel.register(sock, selectors.EVENT_READ)
+
+        seqs = itertools.count()
+        sent: Dict[Tuple[str, int], float] = {}  # (ip, seq) -> send time
+        expiry: Deque[Tuple[float, str, int]] = deque()  # send order == deadline order
+        pending: Dict[str, int] = {}  # ip -> echo requests still unanswered
+        rtts: Dict[str, List[float]] = {}
+
+        def settle(ip: str) -> Optional[PingResult]:
+            pending[ip] -= 1
+            if pending[ip]:
+                return None
+            del pending[ip]
+            samples = rtts.pop(ip)
+            if not samples:
+                return PingResult(ip=ip, up=False, latency_ms=None)
+            return PingResult(ip=ip, up=True, latency_ms=sum(samples) / len(samples))
+
+        it = iter(hosts)
+        exhausted = False
+        try:
+            while True:
+                # Fill the send window
+                while not exhausted and len(sent) < self.window:
+                    ip = next(it, None)
+                    if ip is None:
+                        exhausted = True
+                        break
+                    pending[ip] = 0
+                    rtts[ip] = []
+                    for _ in range(self.count):
+                        seq = next(seqs) & 0xFFFF
+                        try:
+                            sock.sendto(_icmp_echo_packet(ident, seq), (ip, 0))
+                        except OSError:
+                            # unroutable/broadcast target or full send buffer: counts as lost
+                            continue
+                        now = time.perf_counter()
+                        sent[(ip, seq)] = now
+                        expiry.append((now + self.timeout, ip, seq))
+                        pending[ip] += 1
+                    if not pending[ip]:
+                        del pending[ip], rtts[ip]
+                        yield PingResult(ip=ip, up=False, latency_ms=None)
+                if exhausted and not sent:
+                    return
+
+                # Drain replies until the oldest request times out
+                wait = max(0.0, expiry[0][0] - time.perf_counter()) if expiry else 0.0
+                if sel.select(wait):
+                    while True:
+                        try:
+                            data, addr = sock.recvfrom(1024)
+                        except (BlockingIOError, InterruptedError):
+                            break
+                        now = time.perf_counter()
+                        reply = _parse_echo_reply(data)
+                        if reply is None or (raw and reply[0] != ident):
+                            continue
+                        t0 = sent.pop((addr[0], reply[1]), None)
+                        if t0 is None:
+                            continue
+                        rtts[addr[0]].append((now - t0) * 1000.0)
+                        res = settle(addr[0])
+                        if res is not None:
+                            yield res
+
+                # Expire unanswered requests
+                now = time.perf_counter()
+                while expiry and expiry[0][0] <= now:
+                    _, ip, seq = expiry.popleft()
+                    if sent.pop((ip, seq), None) is not None:
+                        res = settle(ip)
+                        if res is not None:
+                            yield res
+        finally:
+            sel.close()
+            sock.close()
+
+
 def ping(ip: str, count: int = 1, timeout: float = 1.0) -> PingResult:
+    if _icmp_supported():
+        try:
+            return _ping_icmp(ip, count, timeout)
+        except OSError:
+            # e.g. IPv6 target or socket limit reached; use the ping binary
+            pass
+    return _ping_subprocess(ip, count, timeout)
+
+
+# Fallback latency patterns for ping output that lacks the usual summary
+_RE_TIME = re.compile(r"time[=<]\s*([0-9]+(?:\.[0-9]+)?)\s*ms", re.IGNORECASE)
+# Linux summary: rtt min/avg/max/mdev = a/b/c/d ms
+_RE_SUMMARY = re.compile(r"=\s*([0-9]+(?:\.[0-9]+)?)/([0-9]+(?:\.[0-9]+)?)/")
+# BSD summary: "round-trip min/avg/max/stddev = 14.654/14.654/14.654/0.000 ms"
+_RE_BSD = re.compile(r"round-trip .*?=\s*([0-9]+(?:\.[0-9]+)?)/([0-9]+(?:\.[0-9]+)?)/", re.IGNORECASE)
+
+# C locale keeps ping's number format stable ("0.23", not "0,23")
+_PING_ENV = {**os.environ, "LC_ALL": "C"}
+
+
+def _parse_ping_latency(output: str) -> Optional[float]:
+    """Return the average RTT from quiet ping output, or None without replies.
+
+    Both Linux and BSD ping -q end with "... = min/avg/max/dev ms" when at
+    least one reply arrived.
+    """
+    _, sep, tail = output.rpartition("=")
+    if sep:
+        try:
+            return float(tail.split("/", 2)[1])
+        except (IndexError, ValueError):
+            pass
+    m = _RE_SUMMARY.search(output) or _RE_BSD.search(output)
+    if m:
+        return float(m.group(2))
+    m = _RE_TIME.search(output)
+    if m:
+        return float(m.group(1))
+    return None
+
+
+def _ping_subprocess(ip: str, count: int, timeout: float) -> PingResult:
     cmd = _build_ping_cmd(ip, count=count, timeout=timeout)
     try:
         proc = subprocess.run(
@@ -56,30 +322,13 @@ def ping(ip: str, count: int = 1, timeout: float = 1.0) -> PingResult:
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
             text=True,
+            env=_PING_ENV,
+            close_fds=False,  # our descriptors are non-inheritable anyway
             timeout=max(timeout * count + 0.5, timeout + 0.5),
             check=False,
         )
-        output = proc.stdout or ""
-        # Normalize decimal commas to dots for locales where ping prints e.g. "time=0,23 ms"
-        output_norm = output.replace(",", ".")
-        success = proc.returncode == 0 or ("bytes from" in output.lower())
-
-        latency = None
-        # Try to parse first reply line: time=XX ms
-        m = re.search(r"time[=<]\s*([0-9]+(?:\.[0-9]+)?)\s*ms", output_norm, re.IGNORECASE)
-        if m:
-            latency = float(m.group(1))
-        else:
-            # Linux summary: rtt min/avg/max/mdev = a/b/c/d ms
-            m2 = re.search(r"=\s*([0-9]+(?:\.[0-9]+)?)/([0-9]+(?:\.[0-9]+)?)/", output_norm)
-            if m2:
-                latency = float(m2.group(2))
-            else:
-                # BSD summary: "round-trip min/avg/max/stddev = 14.654/14.654/14.654/0.000 ms"
-                m3 = re.search(r"round-trip .*?=\s*([0-9]+(?:\.[0-9]+)?)/([0-9]+(?:\.[0-9]+)?)/", output_norm, re.IGNORECASE)
-                if m3:
-                    latency = float(m3.group(2))
-
+        latency = _parse_ping_latency(proc.stdout or "")
+        success = proc.returncode == 0 or latency is not None
         return PingResult(ip=ip, up=bool(success), latency_ms=latency)
     except subprocess.TimeoutExpired:
         return PingResult(ip=ip, up=False, latency_ms=None)
@@ -88,7 +337,26 @@ def ping(ip: str, count: int = 1, timeout: float = 1.0) -> PingResult:
         return PingResult(ip=ip, up=False, latency_ms=None)
 
 
-def expand_targets(target: str) -> List[str]:
+# Octet strings for building dotted quads without int->str per host
+_OCTET_DOT = [f"{i}." for i in range(256)]
+_OCTET = [str(i) for i in range(256)]
+
+
+def _dotted_range(first: int, last: int) -> Iterator[str]:
+    """Yield IPv4 addresses first..last (inclusive) as dotted-quad strings."""
+    while first <= last:
+        # The first three octets are shared by up to 256 consecutive hosts
+        prefix = _OCTET_DOT[first >> 24] + _OCTET_DOT[(first >> 16) & 0xFF] + _OCTET_DOT[(first >> 8) & 0xFF]
+        end = min(last, first | 0xFF)
+        yield from map(prefix.__add__, _OCTET[first & 0xFF:(end & 0xFF) + 1])
+        first = end + 1
+
+
+def expand_targets(target: str) -> Iterator[str]:
+    """Yield the host addresses of a range, CIDR or single IP, lazily.
+
+    Raises ValueError for malformed targets as soon as the generator starts.
+    """
     target = target.strip()
     # Range form: a.b.c.d-e or a.b.c.d-a.b.c.e
     if "-" in target and "/" not in target:
@@ -103,93 +371,336 @@ def expand_targets(target: str) -> List[str]:
                 end_ip = ipaddress.ip_address(".".join(base[:3] + [end]))
             else:
                 raise
-        if int(end_ip) < int(start_ip):
-            start_ip, end_ip = end_ip, start_ip
-        return [str(ipaddress.ip_address(i)) for i in range(int(start_ip), int(end_ip) + 1)]
+        lo, hi = sorted((int(start_ip), int(end_ip)))
+        if start_ip.version == 4:
+            yield from _dotted_range(lo, hi)
+        else:
+            yield from (str(ipaddress.ip_address(i)) for i in range(lo, hi + 1))
+        return
 
     # CIDR or single IP
     try:
         net = ipaddress.ip_network(target, strict=False)
-        return [str(h) for h in net.hosts()] if net.num_addresses > 1 else [str(net.network_address)]
     except ValueError:
         # Single IP format may land here if not network
         ipaddress.ip_address(target)  # validate
-        return [target]
+        yield target
+        return
+    if net.num_addresses == 1:
+        yield str(net.network_address)
+    elif net.version == 4:
+        first = int(net.network_address)
+        last = first + net.num_addresses - 1
+        if net.prefixlen < 31:
+            # Skip network and broadcast addresses, like net.hosts()
+            first, last = first + 1, last - 1
+        yield from _dotted_range(first, last)
+    else:
+        yield from map(str, net.hosts())
+
+
+# struct linger {l_onoff=1, l_linger=0}: close() sends RST and the probe's
+# ephemeral port skips TIME_WAIT, so large scans don't exhaust the range
+_LINGER_RST = struct.pack("ii", 1, 0)
+
+
+def _probe_socket(ip: str) -> socket.socket:
+    s = socket.socket(socket.AF_INET6 if ":" in ip else socket.AF_INET, socket.SOCK_STREAM)
+    s.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, _LINGER_RST)
+    return s
 
 
 def _tcp_probe(ip: str, ports: tuple[int, ...] = (80, 443, 22), timeout: float = 0.3) -> Optional[float]:
     """Try TCP connect to common ports; return latency_ms on first success, else None."""
     for port in ports:
         try:
-            s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            s.settimeout(timeout)
-            t0 = time.perf_counter()
-            s.connect((ip, port))
-            s.close()
-            dt = (time.perf_counter() - t0) * 1000.0
-            return dt
-        except Exception:
-            try:
-                s.close()
-            except Exception:
-                pass
+            with _probe_socket(ip) as s:
+                s.settimeout(timeout)
+                t0 = time.perf_counter()
+                s.connect((ip, port))
+                return (time.perf_counter() - t0) * 1000.0
+        except OSError:
             continue
     return None
 
 
 def scan_cidr(target: str, concurrency: int = 128, timeout: float = 1.0, count: int = 1, tcp_fallback: bool = False) -> Generator[dict, None, None]:
     hosts = expand_targets(target)
-    if not hosts:
-        return
 
     # Bound concurrency
-    workers = max(1, min(concurrency, len(hosts), 1024))
+    workers = max(1, min(concurrency, _POOL_MAX_WORKERS))
+
+    if _icmp_supported() and ":" not in target:
+        # One ICMP socket for the whole sweep
+        results = IcmpSweeper(timeout=timeout, count=count, window=workers).sweep(hosts)
+    else:
+        results = _ping_spawned(hosts, workers, timeout, count)
+    yield from _with_tcp_fallback(results, tcp_fallback, workers)
+
+
+def _ping_spawned(hosts: Iterable[str], window: int, timeout: float, count: int) -> Generator[PingResult, None, None]:
+    """Run the system ping for many hosts from a single thread.
+
+    Up to ``window`` ping processes run at once; their output pipes are
+    multiplexed with one selector instead of parking a thread per host.
+    """
+    sel = selectors.DefaultSelector()
+    procs: Dict[int, Tuple[subprocess.Popen, str, List[bytes]]] = {}  # pipe fd -> (proc, ip, output)
+    expiry: Deque[Tuple[float, int, subprocess.Popen]] = deque()
+    limit = max(timeout * count + 0.5, timeout + 0.5)
+    it = iter(hosts)
+    exhausted = False
+
+    def finish(fd: int, timed_out: bool) -> PingResult:
+        proc, ip, chunks = procs.pop(fd)
+        sel.unregister(proc.stdout)
+        proc.stdout.close()
+        if timed_out:
+            proc.kill()
+        proc.wait()
+        if timed_out:
+            return PingResult(ip=ip, up=False, latency_ms=None)
+        latency = _parse_ping_latency(b"".join(chunks).decode("ascii", "replace"))
+        return PingResult(ip=ip, up=proc.returncode == 0 or latency is not None, latency_ms=latency)
+
+    try:
+        while True:
+            while not exhausted and len(procs) < window:
+                ip = next(it, None)
+                if ip is None:
+                    exhausted = True
+                    break
+                try:
+                    proc = subprocess.Popen(
+                        _build_ping_cmd(ip, count=count, timeout=timeout),
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.STDOUT,
+                        env=_PING_ENV,
+                        close_fds=False,
+                    )
+                except OSError:
+                    # ping binary missing or out of processes
+                    yield PingResult(ip=ip, up=False, latency_ms=None)
+                    continue
+                fd = proc.stdout.fileno()
+                procs[fd] = (proc, ip, [])
+                sel.register(proc.stdout, selectors.EVENT_READ)
+                expiry.append((time.monotonic() + limit, fd, proc))
+            if exhausted and not procs:
+                return
+
+            wait = max(0.0, expiry[0][0] - time.monotonic()) if expiry else 0.0
+            for key, _ in sel.select(wait):
+                chunk = os.read(key.fd, 4096)
+                if chunk:
+                    procs[key.fd][2].append(chunk)
+                else:
+                    yield finish(key.fd, timed_out=False)
+
+            now = time.monotonic()
+            while expiry and expiry[0][0] <= now:
+                _, fd, proc = expiry.popleft()
+                # the fd may already belong to a newer ping
+                if fd in procs and procs[fd][0] is proc:
+                    yield finish(fd, timed_out=True)
+    finally:
+        for proc, _, _ in procs.values():
+            proc.kill()
+            proc.stdout.close()
+            proc.wait()
+        sel.close()
+
+
+# One executor for every scan. Its threads are started on demand and then
+# reused, so repeated scans don't create and join up to 1024 threads each
+# time; callers bound their own concurrency (_bounded_submit,
+# _with_tcp_fallback) instead.
+_POOL_MAX_WORKERS = 1024
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=_POOL_MAX_WORKERS, thread_name_prefix="netscan")
+    return _pool
 
-    def worker(ip: str) -> dict:
-        res = ping(ip, count=count, timeout=timeout)
-        if (not res.up) and tcp_fallback:
-            lat = _tcp_probe(ip)
-            if lat is not None:
-                res = PingResult(ip=ip, up=True, latency_ms=lat)
-        return res.as_dict()
 
-    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="netscan") as ex:
-        future_map = {ex.submit(worker, ip): ip for ip in hosts}
-        for fut in as_completed(future_map):
-            res = fut.result()
-            yield res
+def _bounded_submit(ex: ThreadPoolExecutor, fn: Callable, items: Iterable, limit: int) -> Generator[Future, None, None]:
+    """Submit ``fn(item)`` for each item, keeping at most ``limit`` futures pending.
+
+    Futures are yielded as they complete; a new item is submitted for each
+    one, so memory stays constant however large ``items`` is.
+    """
+    it = iter(items)
+    pending = {ex.submit(fn, x) for x in itertools.islice(it, limit)}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for fut in done:
+            for x in itertools.islice(it, 1):
+                pending.add(ex.submit(fn, x))
+            yield fut
+
+
+def _with_tcp_fallback(results: Iterable[PingResult], tcp_fallback: bool, workers: int) -> Generator[dict, None, None]:
+    if not tcp_fallback:
+        for res in results:
+            yield res.as_dict()
+        return
+    # Probe silent hosts over TCP while the ping sweep is still running, at
+    # most ``workers`` at a time: when that many are pending, the sweep
+    # waits for one to finish before submitting the next
+    ex = _get_pool()
+    probes: Dict[Future, str] = {}
+
+    def finished() -> Generator[dict, None, None]:
+        done, _ = wait(probes, return_when=FIRST_COMPLETED)
+        for fut in done:
+            ip = probes.pop(fut)
+            lat = fut.result()
+            yield PingResult(ip=ip, up=lat is not None, latency_ms=lat).as_dict()
+
+    for res in results:
+        if res.up:
+            yield res.as_dict()
+            continue
+        if len(probes) >= workers:
+            yield from finished()
+        probes[ex.submit(_tcp_probe, res.ip)] = res.ip
+    while probes:
+        yield from finished()
 
 
 def _tcp_connect(ip: str, port: int, timeout: float = 0.5) -> bool:
     try:
-        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        s.settimeout(timeout)
-        s.connect((ip, port))
-        s.close()
-        return True
-    except Exception:
+        with _probe_socket(ip) as s:
+            s.settimeout(timeout)
+            s.connect((ip, port))
+            return True
+    except OSError:
+        return False
+
+
+# Platforms where port_scan drives non-blocking connects from one selector
+# loop instead of a thread per port (epoll on Linux, kqueue on macOS)
+_REACTOR_SYSTEMS = ("Linux", "Darwin")
+
+
+def _connect_scan(ip: str, ports: Iterable[int], window: int, timeout: float,
+                  cancel: Optional[threading.Event] = None) -> List[int]:
+    """Connect-scan ``ports`` with non-blocking sockets and a single selector.
+
+    Up to ``window`` connects are in flight; each one gets ``timeout`` seconds
+    to become writable, after which SO_ERROR tells whether it was accepted.
+    Setting ``cancel`` stops the scan within ~100ms and returns what was found.
+    """
+    sel = selectors.DefaultSelector()
+    inflight: Dict[int, Tuple[socket.socket, int]] = {}  # fd -> (sock, port)
+    expiry: Deque[Tuple[float, int, socket.socket]] = deque()
+    open_ports: List[int] = []
+    it = iter(ports)
+    exhausted = False
+
+    def close(s: socket.socket) -> None:
         try:
-            s.close()
-        except Exception:
+            sel.unregister(s)
+        except (KeyError, ValueError):
             pass
-        return False
+        inflight.pop(s.fileno(), None)
+        s.close()
+
+    try:
+        while True:
+            if cancel is not None and cancel.is_set():
+                break
+            while not exhausted and len(inflight) < window:
+                port = next(it, None)
+                if port is None:
+                    exhausted = True
+                    break
+                try:
+                    s = _probe_socket(ip)
+                except OSError as e:
+                    # Out of descriptors (macOS defaults to 256): retry the
+                    # port later and keep the window at what fits
+                    if e.errno != errno.EMFILE or not inflight:
+                        raise
+                    it = itertools.chain((port,), it)
+                    window = len(inflight)
+                    break
+                s.setblocking(False)
+                rc = s.connect_ex((ip, port))
+                if rc == 0:
+                    open_ports.append(port)
+                    s.close()
+                elif rc in (errno.EINPROGRESS, errno.EWOULDBLOCK):
+                    inflight[s.fileno()] = (s, port)
+                    sel.register(s, selectors.EVENT_WRITE)
+                    expiry.append((time.monotonic() + timeout, port, s))
+                else:
+                    s.close()
+            if exhausted and not inflight:
+                break
+
+            wait = max(0.0, expiry[0][0] - time.monotonic()) if expiry else 0.0
+            if cancel is not None:
+                wait = min(wait, 0.1)
+            for key, _ in sel.select(wait):
+                s, port = inflight[key.fd]
+                if s.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
+                    open_ports.append(port)
+                close(s)
+
+            now = time.monotonic()
+            while expiry and expiry[0][0] <= now:
+                _, _, s = expiry.popleft()
+                if s.fileno() != -1:
+                    close(s)
+    finally:
+        for s, _ in list(inflight.values()):
+            s.close()
+        sel.close()
+    return open_ports
+
 
+def _fd_budget() -> int:
+    """Sockets a scan may hold open: half the soft RLIMIT_NOFILE."""
+    soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY:
+        return _POOL_MAX_WORKERS
+    return max(1, soft // 2)
 
-def port_scan(ip: str, ports: Iterable[int], concurrency: int = 256, timeout: float = 0.5) -> List[int]:
-    """Return list of open ports using TCP connect scanning."""
-    ports = list(ports)
+
+def port_scan(ip: str, ports: Iterable[int], concurrency: int = 256, timeout: float = 0.5,
+              cancel: Optional[threading.Event] = None) -> List[int]:
+    """Return list of open ports using TCP connect scanning.
+
+    If ``cancel`` is set while scanning, no further ports are probed and the
+    open ports found so far are returned.
+    """
+    if not isinstance(ports, (list, tuple, range)):
+        ports = list(ports)
     if not ports:
         return []
-    workers = max(1, min(concurrency, len(ports), 1024))
+    workers = max(1, min(concurrency, len(ports), _POOL_MAX_WORKERS))
+    if platform.system() in _REACTOR_SYSTEMS and ":" not in ip:
+        return sorted(_connect_scan(ip, ports, min(workers, _fd_budget()), timeout, cancel))
     open_ports: List[int] = []
-    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="netscan-ports") as ex:
-        futs = {ex.submit(_tcp_connect, ip, p, timeout): p for p in ports}
-        for fut in as_completed(futs):
-            p = futs[fut]
-            try:
-                if fut.result():
-                    open_ports.append(p)
-            except Exception:
-                pass
+
+    def probe(p: int) -> Tuple[int, bool]:
+        return p, _tcp_connect(ip, p, timeout)
+
+    for fut in _bounded_submit(_get_pool(), probe, ports, workers):
+        if cancel is not None and cancel.is_set():
+            break
+        try:
+            p, is_open = fut.result()
+            if is_open:
+                open_ports.append(p)
+        except Exception:
+            pass
     open_ports.sort()
     return open_ports
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import ctypes
+import ctypes.util
 import platform
-import re
+import struct
 import subprocess
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 
 
 def _run(cmd: list[str]) -> str:
@@ -14,53 +16,96 @@ def _run(cmd: list[str]) -> str:
         return ""
 
 
+# sysctl(CTL_NET, PF_ROUTE, 0, 0, NET_RT_IFLIST2, 0) returns one if_msghdr2
+# per interface (<net/if.h>, <net/route.h>), each followed by its sockaddr_dl
+_IFLIST2_MIB = (4, 17, 0, 0, 6, 0)  # CTL_NET, PF_ROUTE, 0, 0, NET_RT_IFLIST2, 0
+_RTM_IFINFO2 = 0x12
+_IFM_HDR = struct.Struct("=HBB")  # ifm_msglen, ifm_version, ifm_type
+_IFM_BYTES = struct.Struct("=QQ")  # ifm_data.ifi_ibytes, ifm_data.ifi_obytes
+_IFM_BYTES_OFF = 32 + 64  # ifm_data offset + ifi_ibytes offset in if_data64
+_IFM_SIZE = 160  # sizeof(struct if_msghdr2); the sockaddr_dl follows
+_SDL_NLEN_OFF = 5  # sdl_len, sdl_family, sdl_index(2), sdl_type, sdl_nlen
+_SDL_DATA_OFF = 8
+
+_sysctl = None  # libc sysctl(3), resolved on first use
+
+
+def _parse_iflist2(buf: bytes) -> Dict[str, Tuple[int, int]]:
+    """Map interface name -> (rx_bytes, tx_bytes) from a NET_RT_IFLIST2 dump."""
+    counters: Dict[str, Tuple[int, int]] = {}
+    off, end = 0, len(buf)
+    while off + _IFM_HDR.size <= end:
+        msglen, _, msgtype = _IFM_HDR.unpack_from(buf, off)
+        if msglen == 0:
+            break
+        if msgtype == _RTM_IFINFO2 and msglen >= _IFM_SIZE + _SDL_DATA_OFF:
+            sdl = off + _IFM_SIZE
+            nlen = buf[sdl + _SDL_NLEN_OFF]
+            name = buf[sdl + _SDL_DATA_OFF:sdl + _SDL_DATA_OFF + nlen].decode("ascii", "replace")
+            counters[name] = _IFM_BYTES.unpack_from(buf, off + _IFM_BYTES_OFF)
+        off += msglen
+    return counters
+
+
+def _darwin_iflist() -> Optional[Dict[str, Tuple[int, int]]]:
+    """Read all interface byte counters with one sysctl, or None if unavailable."""
+    global _sysctl
+    try:
+        if _sysctl is None:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            _sysctl = libc.sysctl
+        mib = (ctypes.c_int * len(_IFLIST2_MIB))(*_IFLIST2_MIB)
+        size = ctypes.c_size_t(0)
+        for _ in range(3):  # the table can grow between the two calls
+            if _sysctl(mib, len(_IFLIST2_MIB), None, ctypes.byref(size), None, 0) != 0:
+                return None
+            buf = ctypes.create_string_buffer(size.value)
+            if _sysctl(mib, len(_IFLIST2_MIB), buf, ctypes.byref(size), None, 0) == 0:
+                return _parse_iflist2(buf.raw[:size.value])
+        return None
+    except Exception:
+        return None
+
+
+def _netstat_counters(interface: str) -> Optional[Tuple[int, int]]:
+    out = _run(["netstat", "-ibn"])  # columns include Ibytes Obytes
+    # Name  Mtu   Network     Address            Ipkts Ierrs     Ibytes    Opkts Oerrs     Obytes  Coll
+    lines = out.splitlines()
+    header = next((hl.split() for hl in lines if hl.strip().startswith("Name")), None)
+    if not header or "Ibytes" not in header or "Obytes" not in header:
+        return None
+    i_idx = header.index("Ibytes")
+    o_idx = header.index("Obytes")
+    for line in lines:
+        cols = line.split()
+        if not cols or cols[0] != interface:
+            continue
+        try:
+            return int(cols[i_idx]), int(cols[o_idx])
+        except (IndexError, ValueError):
+            # Rows without an address column are shorter; try the next one
+            continue
+    return None
+
+
 def get_bytes_counters(interface: str) -> Optional[Tuple[int, int]]:
     """Return (rx_bytes, tx_bytes) for the given interface, or None if not found."""
     system = platform.system().lower()
     if system == "darwin":
-        out = _run(["netstat", "-ibn"])  # columns include Ibytes Obytes
-        # Name  Mtu   Network     Address            Ibytes     Obytes ...
-        rx = tx = None
-        for line in out.splitlines():
-            parts = line.split()
-            if not parts or parts[0] != interface:
-                continue
-            # Try to locate Ibytes/OBytes assuming typical column order
-            # Some versions have: Name Mtu Net ... Ipkts Ierrs Opkts Oerrs Coll Ibytes Obytes ...
-            m = re.findall(r"\s(\d+)\s(\d+)\s*$", line)
-            # Fallback: parse by column headers position
-            if "Ibytes" in out and "Obytes" in out:
-                # attempt header index mapping
-                header = None
-                for hl in out.splitlines():
-                    if hl.strip().startswith("Name") and "Ibytes" in hl and "Obytes" in hl:
-                        header = hl
-                        break
-                if header:
-                    hcols = header.split()
-                    cols = line.split()
-                    try:
-                        i_idx = hcols.index("Ibytes")
-                        o_idx = hcols.index("Obytes")
-                        rx = int(cols[i_idx])
-                        tx = int(cols[o_idx])
-                        return rx, tx
-                    except Exception:
-                        pass
-            # Very rough fallback: not reliable
-        return None
+        counters = _darwin_iflist()
+        if counters is not None:
+            return counters.get(interface)
+        return _netstat_counters(interface)
     else:
         # Linux: /proc/net/dev
+        prefix = interface + ":"
         try:
             with open("/proc/net/dev", "r") as f:
                 for line in f:
-                    line = line.strip()
-                    if not line or ":" not in line:
-                        continue
-                    if_name, rest = [s.strip() for s in line.split(":", 1)]
-                    if if_name != interface:
+                    line = line.lstrip()
+                    if not line.startswith(prefix):
                         continue
-                    fields = rest.split()
+                    fields = line[len(prefix):].split()
                     # fields: recv: bytes packets errs drop fifo frame compressed multicast
                     #          trans: bytes packets errs drop fifo colls carrier compressed
                     if len(fields) >= 16:
@@ -1,12 +1,23 @@
 from __future__ import annotations
 
+import argparse
 import curses
+import curses.panel
+import functools
+import heapq
+import itertools
 import time
 import threading
 import textwrap
 import socket
+import struct
 import json
-from typing import List, Optional, Dict, Tuple
+import os
+import sys
+import ipaddress
+import operator
+from collections import deque
+from typing import Deque, List, Optional, Dict, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -25,8 +36,141 @@ from .profiles import (
 )
 
 
+def _ip_sort_key(ip: str) -> int:
+    """Pack an address into an int once so sorting needs no string work."""
+    try:
+        return struct.unpack("!I", socket.inet_aton(ip))[0]
+    except OSError:
+        try:
+            return int(ipaddress.ip_address(ip))
+        except ValueError:
+            return 1 << 128  # unparsable: sort last
+
+
+_NO_MAC_KEY = "zz:zz:zz:zz:zz:zz"
+
+# One host-table row: ip, status, latency, hostname at columns 0, 17, 26, 37;
+# every field is truncated to its width so long values can't shift the rest
+_ROW_FMT = "{:<15.15}  {:<6.6}   {:<8.8}   {:<20.20}".format
+
+
+def _row_line(r: dict) -> str:
+    """Table text for a result row; stored on the row as _line when it changes."""
+    lat = r.get("latency_ms")
+    if lat is None:
+        lat_s = "-"
+    else:
+        lat_s = f"{lat:.2f} ms"
+        if len(lat_s) > 8:
+            lat_s = f"{lat:.0f} ms"  # 100 ms and up: whole milliseconds fit
+    return _ROW_FMT(
+        r["ip"],
+        "UP" if r.get("up") else "DOWN",
+        lat_s,
+        r.get("hostname") or "-",
+    )
+
+# Sort key per column; rows carry precomputed _ipk (packed IP), _lk
+# (latency, inf when unknown), _hk (lowercased hostname) and _mk
+# (lowercased MAC) fields
+_SORT_KEYS = {
+    "ip": operator.itemgetter("_ipk"),
+    "status": lambda r: 0 if r.get("up") else 1,
+    "latency": operator.itemgetter("_lk"),
+    "hostname": operator.itemgetter("_hk"),
+    "mac": operator.itemgetter("_mk"),
+}
+
+# Column order for the 'o' key and the 1-5 shortcuts
+_SORT_ORDER = ("ip", "status", "latency", "hostname", "mac")
+_SORT_NEXT = dict(zip(_SORT_ORDER, _SORT_ORDER[1:] + _SORT_ORDER[:1]))
+_KEY_TO_SORT = {ord(str(n)): col for n, col in enumerate(_SORT_ORDER, 1)}
+
+
+# Traffic history: samples kept (one per second) and moving-average width
+_RATE_HISTORY = 600
+_RATE_SMOOTH = 4
+
+
+def _tail(series: Deque[float], n: int):
+    """Iterate the last n entries of a deque without copying it."""
+    return itertools.islice(series, max(0, len(series) - n), None)
+
+
+_SPARK_BLOCKS = "▁▂▃▄▅▆▇█"
+
+_INPUT_TIMEOUT_MS = 250
+# Smallest terminal the full layout is drawn in
+_MIN_H = 8
+_MIN_W = 40
+# Seconds the selection must rest on a host before j/k start its port scan
+_PORTSCAN_DEBOUNCE = 0.15
+# Seconds between port scan cache writes while results keep arriving
+_CACHE_FLUSH_INTERVAL = 5.0
+
+
+# DEC private mode 2026 (synchronized output): supporting terminals show a
+# frame only once all of it has arrived, others ignore the sequence
+_SYNC_BEGIN = b"\033[?2026h"
+_SYNC_END = b"\033[?2026l"
+
+
+def _sync_write(seq: bytes) -> None:
+    """Write a synchronized-output marker around a curses refresh.
+
+    curses flushes its own output at the end of each refresh, so a raw write
+    to the terminal before and after one brackets exactly that frame.
+    """
+    try:
+        os.write(sys.__stdout__.fileno(), seq)
+    except (AttributeError, OSError, ValueError):
+        pass
+
+
+_RATE_UNITS = ("B/s", "KB/s", "MB/s", "GB/s")
+_RATE_SCALES = (1.0, 1024.0, 1024.0 ** 2, 1024.0 ** 3)
+
+
+@functools.lru_cache(maxsize=8)
+def _fmt_rate(bps: float) -> str:
+    """Format a byte rate with a binary unit; repeated (idle) rates hit the cache."""
+    i = min(3, max(0, int(bps).bit_length() - 1) // 10)
+    return f"{bps / _RATE_SCALES[i]:6.1f} {_RATE_UNITS[i]}"
+
+
+@functools.lru_cache(maxsize=16)
+def _panel_rule(corner: str, fill: str, width: int) -> str:
+    """Closing line of a details-panel section, built once per panel width."""
+    return corner + fill * (width - 1)
+
+
+# Enrichment: reverse DNS answers (negative ones too) are reused across
+# rescans and queried in batches of _PTR_BATCH; the ARP table is read once
+# when a scan starts and once when it ends
+_PTR_TTL = 900.0
+_PTR_BATCH = 256
+# Scan results are stored in batches sized from the profile concurrency
+# (bounded by these limits), or after _ENRICH_MAX_DELAY seconds on slow scans
+_ENRICH_BATCH_MIN = 16
+_ENRICH_BATCH_MAX = 256
+_ENRICH_MAX_DELAY = 0.25
+
+
+# Service names for common ports the system services database may lack
+_COMMON_SERVICES = {
+    21: 'ftp', 22: 'ssh', 23: 'telnet', 25: 'smtp',
+    53: 'domain', 80: 'http', 110: 'pop3', 143: 'imap',
+    443: 'https', 445: 'smb', 3306: 'mysql', 3389: 'rdp',
+    5432: 'postgresql', 5900: 'vnc', 6379: 'redis',
+    8080: 'http-proxy', 8443: 'https-alt', 27017: 'mongodb'
+}
+
+
 class TuiApp:
-    def __init__(self) -> None:
+    # port -> service name; the services database doesn't change at runtime
+    _svc_cache: Dict[int, str] = {}
+
+    def __init__(self, max_fps: float = 30.0) -> None:
         self.iface = get_default_interface() or "en0"
         self.cidr = get_local_network_cidr() or "192.168.1.0/24"
         self.stop = False
@@ -34,16 +178,29 @@ class TuiApp:
         self.tx_prev = None
         self.rx_rate = 0.0
         self.tx_rate = 0.0
-        self.rate_lock = threading.Lock()
+        self._rate_ts: Optional[float] = None  # monotonic time of the last counter read
         self.scan_results: List[dict] = []
-        self.scan_lock = threading.Lock()
+        self.scan_lock = threading.Lock()  # guards scan_results for writers
+        # Read-only view of scan_results for the UI thread. Writers never
+        # modify a published row: each batch stores new row dicts and then
+        # republishes the tuple, so readers take the reference without
+        # locking or copying and always see whole batches.
+        self._results_snapshot: Tuple[dict, ...] = ()
+        self._up_count = 0  # rows with up=True, kept in step with scan_results
         self.scanning = False
         self.last_scan_ts: Optional[float] = None
+        # footer text for last_scan_ts, reformatted only when it changes
+        self._last_scan_ts_rendered: Optional[float] = None
+        self._last_scan_str = ""
         # UI state
         self.only_up = False  # Changed to False to show all hosts by default
         self.sel = 0
-        self.rx_hist: List[float] = []
-        self.tx_hist: List[float] = []
+        self.rx_hist: Deque[float] = deque(maxlen=_RATE_HISTORY)
+        self.tx_hist: Deque[float] = deque(maxlen=_RATE_HISTORY)
+        # moving averages of the history, appended once per sample
+        self.rx_smooth: Deque[float] = deque(maxlen=_RATE_HISTORY)
+        self.tx_smooth: Deque[float] = deque(maxlen=_RATE_HISTORY)
+        self._rate_samples = 0  # history samples taken; keys the graph line cache
         # sorting state
         self.sort_by = "ip"  # one of: ip, status, latency, hostname, mac
         self.sort_desc = False
@@ -51,26 +208,87 @@ class TuiApp:
         self.portscan_target: Optional[str] = None
         self.portscan_open: List[int] = []
         self.portscan_running = False
-        # Persistent cache with TTL: ip -> (ports, timestamp)
+        self._portscan_cancel = threading.Event()  # owned by the latest worker
+        self._portscan_lock = threading.Lock()  # guards the swap of the fields above
+        # (ip, cancel event, monotonic launch time) of a debounced scan
+        self._portscan_pending: Optional[Tuple[str, threading.Event, float]] = None
+        # Persistent cache with TTL: ip -> (ports, monotonic expiry deadline)
         self.portscan_cache: Dict[str, Tuple[List[int], float]] = {}
         self.portscan_current_port: Optional[int] = None  # Current port being scanned
         self.cache_ttl = 3600  # Cache TTL in seconds (1 hour default)
         self.cache_file = Path.home() / ".netscan_cache.json"
+        # New results only mark the cache dirty; _cache_flusher writes it
+        self._cache_dirty = threading.Event()
+        self._cache_save_lock = threading.Lock()
+        # (deadline, ip) min-heap over portscan_cache for _clear_expired_cache;
+        # entries for replaced or removed results are skipped when popped
+        self._cache_expiry: List[Tuple[float, str]] = []
+        self._cache_expiry_lock = threading.Lock()
+        # details panel window, recreated only when its geometry changes
+        self._panel_win = None
+        self._panel = None  # curses.panel stacking _panel_win over stdscr
+        self._panel_geom: Optional[Tuple[int, int, int, int]] = None
         # details overlay
         self.detail_active = False
         self.detail_ip: Optional[str] = None
         # auto scan on first launch
         self.auto_scan_started = False
-        # map ip -> index in scan_results for fast merge
+        # Pre-filled rows sit at index _ip_sort_key(ip) - _ip_base (the
+        # first _prefilled rows); only rows appended after them are mapped
+        # ip -> index here
+        self._ip_base = 0
+        self._prefilled = 0
         self._ip_index: dict[str, int] = {}
+        # sorted and filtered views of scan_results, rebuilt only when the
+        # results, the sort order or the filter change
+        self._sorted_rows: List[dict] = []
+        self._view_rows: List[dict] = []
+        self._sort_dirty = True
+        self._view_dirty = True
+        # Set by anything that changes what is on screen. An idle UI still
+        # samples traffic once a second but only re-renders when that
+        # changes the graph, or each second while a timed element (cache
+        # age, export message) is on screen
+        self._dirty = True
+        self._last_render = float("-inf")
+        self._next_sample = float("-inf")  # monotonic time of the next rate sample
+        self._ticking = False  # last frame showed a timed element
+        # Frame budget: renders are at least this far apart (0 = uncapped)
+        self.max_fps = max_fps
+        self._frame_interval = 1.0 / max_fps if max_fps > 0 else 0.0
         # export state
         self.export_message: Optional[str] = None
-        self.export_message_time: Optional[float] = None
+        self.export_message_time: Optional[float] = None  # time.monotonic() when shown
         self.export_message_color: int = 1  # 1=green, 2=red
         # scan progress
         self.scan_current_host: Optional[str] = None  # Currently scanning host
         # scan profile
         self.active_profile: ScanProfile = PREDEFINED_PROFILES['normal']  # Default to normal profile
+        # enrichment caches: ip -> (hostname, monotonic ts); last ARP map
+        self._ptr_cache: Dict[str, Tuple[Optional[str], float]] = {}
+        self._arp_cache: Dict[str, str] = {}
+        # key code -> handler(stdscr, rows)
+        self._keymap = {
+            ord('q'): self._key_quit,
+            ord('s'): self._key_scan,
+            ord('e'): self._key_export,
+            ord('P'): self._key_profile,
+            ord('C'): self._key_clear_cache,
+            ord('r'): self._key_refresh,
+            ord('a'): self._key_filter,
+            ord('o'): self._key_sort_next,
+            ord('O'): self._key_sort_order,
+            ord('p'): self._key_rescan_ports,
+            10: self._key_rescan_ports,
+            13: self._key_rescan_ports,
+            curses.KEY_ENTER: self._key_rescan_ports,
+            curses.KEY_UP: self._key_up,
+            ord('k'): self._key_up,
+            curses.KEY_DOWN: self._key_down,
+            ord('j'): self._key_down,
+        }
+        for code, col in _KEY_TO_SORT.items():
+            self._keymap[code] = functools.partial(self._key_sort_column, col)
         
         # Load persistent cache
         self._load_cache()
@@ -81,34 +299,62 @@ class TuiApp:
             if self.cache_file.exists():
                 with open(self.cache_file, 'r') as f:
                     data = json.load(f)
-                    # Filter expired entries
-                    now = time.time()
+                    # Turn the stored wall-clock scan times into monotonic
+                    # deadlines and drop entries that have already expired
+                    now = time.monotonic()
+                    shift = now + self.cache_ttl - time.time()
                     self.portscan_cache = {
-                        ip: (ports, ts)
+                        ip: (ports, ts + shift)
                         for ip, (ports, ts) in data.items()
-                        if now - ts < self.cache_ttl
+                        if ts + shift > now
                     }
+                    expiry = [(deadline, ip) for ip, (_, deadline) in self.portscan_cache.items()]
+                    heapq.heapify(expiry)
+                    self._cache_expiry = expiry
         except Exception:
             self.portscan_cache = {}
+            self._cache_expiry = []
     
     def _save_cache(self) -> None:
         """Save port scan cache to disk."""
         try:
-            # Only save non-expired entries
-            now = time.time()
+            # Only save non-expired entries, stored as wall-clock scan
+            # times; list() snapshots the items so a worker adding one
+            # meanwhile cannot break the iteration
+            now = time.monotonic()
+            shift = time.time() - now - self.cache_ttl
             data = {
-                ip: (ports, ts)
-                for ip, (ports, ts) in self.portscan_cache.items()
-                if now - ts < self.cache_ttl
+                ip: (ports, deadline + shift)
+                for ip, (ports, deadline) in list(self.portscan_cache.items())
+                if deadline > now
             }
-            with open(self.cache_file, 'w') as f:
-                json.dump(data, f)
+            # Write a sibling temp file and rename it over the cache so a
+            # crash mid-write never leaves a truncated cache behind
+            tmp = self.cache_file.with_suffix('.tmp')
+            with self._cache_save_lock:
+                with open(tmp, 'w') as f:
+                    json.dump(data, f, separators=(',', ':'))
+                os.replace(tmp, self.cache_file)
         except Exception:
             pass
+
+    def _flush_cache(self) -> None:
+        """Save the cache if it changed since the last save."""
+        if self._cache_dirty.is_set():
+            self._cache_dirty.clear()
+            self._save_cache()
+
+    def _cache_flusher(self) -> None:
+        """Persist port scan results at most every _CACHE_FLUSH_INTERVAL seconds."""
+        while not self.stop:
+            time.sleep(_CACHE_FLUSH_INTERVAL)
+            self._flush_cache()
     
     def _clear_cache(self) -> None:
         """Clear all cache entries."""
         self.portscan_cache = {}
+        with self._cache_expiry_lock:
+            self._cache_expiry = []
         try:
             if self.cache_file.exists():
                 self.cache_file.unlink()
@@ -117,97 +363,173 @@ class TuiApp:
     
     def _clear_expired_cache(self) -> None:
         """Remove expired cache entries."""
-        now = time.time()
-        expired = [
-            ip for ip, (_, ts) in self.portscan_cache.items()
-            if now - ts >= self.cache_ttl
-        ]
-        for ip in expired:
-            del self.portscan_cache[ip]
-
-    def _update_rates(self) -> None:
-        while not self.stop:
-            counters = get_bytes_counters(self.iface)
-            if counters is not None:
-                rx, tx = counters
-                if self.rx_prev is not None and self.tx_prev is not None:
-                    dt = max(0.001, 1.0)
-                    with self.rate_lock:
-                        self.rx_rate = max(0.0, (rx - self.rx_prev) / dt)
-                        self.tx_rate = max(0.0, (tx - self.tx_prev) / dt)
-                        # history
-                        self.rx_hist.append(self.rx_rate)
-                        self.tx_hist.append(self.tx_rate)
-                        # cap history
-                        max_len = 600
-                        if len(self.rx_hist) > max_len:
-                            self.rx_hist = self.rx_hist[-max_len:]
-                        if len(self.tx_hist) > max_len:
-                            self.tx_hist = self.tx_hist[-max_len:]
-                self.rx_prev, self.tx_prev = rx, tx
-            time.sleep(1.0)
+        now = time.monotonic()
+        cache = self.portscan_cache
+        with self._cache_expiry_lock:
+            heap = self._cache_expiry
+            while heap and heap[0][0] <= now:
+                deadline, ip = heapq.heappop(heap)
+                entry = cache.get(ip)
+                if entry is not None and entry[1] == deadline:
+                    del cache[ip]
+
+    def _sample_rates(self, now: float) -> None:
+        """Read the interface counters and update rates/history.
+
+        Called from the draw loop about once a second; only that thread
+        touches the rate fields, so no locking is needed.
+        """
+        counters = get_bytes_counters(self.iface)
+        if counters is None:
+            return
+        rx, tx = counters
+        if self.rx_prev is not None and self.tx_prev is not None and self._rate_ts is not None:
+            dt = max(0.001, now - self._rate_ts)
+            self.rx_rate = max(0.0, (rx - self.rx_prev) / dt)
+            self.tx_rate = max(0.0, (tx - self.tx_prev) / dt)
+            # history (deques drop the oldest sample themselves)
+            for hist, smooth, rate in (
+                (self.rx_hist, self.rx_smooth, self.rx_rate),
+                (self.tx_hist, self.tx_smooth, self.tx_rate),
+            ):
+                hist.append(rate)
+                n = min(_RATE_SMOOTH, len(hist))
+                smooth.append(sum(_tail(hist, n)) / n)
+            self._rate_samples += 1
+        self.rx_prev, self.tx_prev = rx, tx
+        self._rate_ts = now
 
     def _scan(self) -> None:
-        # Start a scan and enrich results incrementally
-        self.scanning = True
+        # Run a scan and enrich results incrementally; callers set scanning
+        # before starting the thread so queued keys can't start a second one
         self.scan_current_host = None
+        # Pre-fill all hosts in the CIDR so every IP is visible immediately.
+        # Targets expand to consecutive addresses, so the packed sort key of
+        # each row is the first one plus its offset.
+        ips_all = list(expand_targets(self.cidr))
+        base = _ip_sort_key(ips_all[0]) if ips_all else 0
+        blank = {"up": False, "latency_ms": None, "hostname": None, "mac": None,
+                 "_lk": float("inf"), "_hk": "", "_mk": _NO_MAC_KEY}
+        results = [{**blank, "ip": ip, "_ipk": k, "_line": _ROW_FMT(ip, "DOWN", "-", "-")}
+                   for k, ip in enumerate(ips_all, base)]
         with self.scan_lock:
-            # Pre-fill all hosts in the CIDR so every IP is visible immediately
-            ips_all = expand_targets(self.cidr)
-            self.scan_results = [
-                {"ip": ip, "up": False, "latency_ms": None, "hostname": None, "mac": None}
-                for ip in ips_all
-            ]
-            self._ip_index = {ip: i for i, ip in enumerate(ips_all)}
+            self.scan_results = results
+            self._ip_base = base
+            self._prefilled = len(results)
+            self._ip_index = {}
+            self._results_snapshot = tuple(results)
+            self._up_count = 0
+            self._sort_dirty = True
         
         # Use profile settings for scan
         concurrency = self.active_profile.concurrency
         timeout = self.active_profile.timeout
         
-        # Single scan pass with batched enrichment
+        # Single scan pass: up/latency are stored per batch, names follow
+        # in a second wave once _PTR_BATCH addresses are pending
+        self._arp_cache = get_arp_table()
+        batch_size = min(_ENRICH_BATCH_MAX, max(_ENRICH_BATCH_MIN, concurrency // 4))
         batch: List[dict] = []
+        scanned: List[str] = []
+        pending_ptr: List[str] = []
+        last_flush = time.monotonic()
         for r in scan_cidr(self.cidr, concurrency=concurrency, timeout=timeout, count=1, tcp_fallback=True):
             self.scan_current_host = r.get('ip')  # Update current host
             batch.append(r)
-            if len(batch) >= 32:
+            now = time.monotonic()
+            if len(batch) >= batch_size or now - last_flush >= _ENRICH_MAX_DELAY:
+                last_flush = now
                 self._enrich_and_store(batch)
+                pending_ptr.extend(r["ip"] for r in batch)
                 batch = []
+                if len(pending_ptr) >= _PTR_BATCH:
+                    self._fill_names(pending_ptr)
+                    scanned.extend(pending_ptr)
+                    pending_ptr = []
         if batch:
             self._enrich_and_store(batch)
+            pending_ptr.extend(r["ip"] for r in batch)
+        scanned.extend(pending_ptr)
+        # The sweep has populated the ARP table: read it again and fill in
+        # MACs everywhere (PTRs resolved earlier come from the cache)
+        self._arp_cache = get_arp_table()
+        self._fill_names(scanned)
         self.scan_current_host = None  # Clear after scan complete
-        self.last_scan_ts = time.time()
-        self.scanning = False
+        with self.scan_lock:
+            self.last_scan_ts = time.time()
+            self.scanning = False
+            self._dirty = True
 
-    def _portscan_worker(self, ip: str) -> None:
+    def _start_portscan(self, ip: str, delay: float = 0.0) -> None:
+        """Port-scan ip in the background, cancelling any scan still running.
+
+        With a delay the worker is only launched once ip has stayed selected
+        that long, so key repeat does not start a scan per row passed over.
+        """
+        with self._portscan_lock:
+            self._portscan_cancel.set()
+            cancel = threading.Event()
+            self._portscan_cancel = cancel
+            self.portscan_target = ip
+            self.portscan_open = []
+            self.portscan_running = True
+        now = time.monotonic()
+        self._portscan_pending = (ip, cancel, now + delay)
+        self._launch_pending_portscan(now)
+
+    def _launch_pending_portscan(self, now: float) -> None:
+        pending = self._portscan_pending
+        if pending is not None and now >= pending[2]:
+            self._portscan_pending = None
+            ip, cancel, _ = pending
+            threading.Thread(target=self._portscan_worker, args=(ip, cancel), daemon=True).start()
+
+    def _portscan_worker(self, ip: str, cancel: threading.Event) -> None:
         # Check cache first (with TTL validation)
         if ip in self.portscan_cache:
-            ports, ts = self.portscan_cache[ip]
-            age = time.time() - ts
-            if age < self.cache_ttl:
+            ports, deadline = self.portscan_cache[ip]
+            if time.monotonic() < deadline:
                 # Cache is still valid
-                self.portscan_open = ports
-                self.portscan_running = False
+                self._publish_portscan(cancel, ports)
                 return
             else:
                 # Cache expired, remove it
-                del self.portscan_cache[ip]
+                self.portscan_cache.pop(ip, None)
         
         # Get ports from active profile
         ports = get_ports_from_range(self.active_profile.port_range)
         self.portscan_current_port = 0
         try:
             # Use the fast concurrent port_scan function
-            openp = port_scan(ip, ports, concurrency=256, timeout=0.5)
-            # Simulate progress by updating current_port during scan
-            # (The actual scan is too fast to show individual ports, but we track total)
+            openp = port_scan(ip, ports, concurrency=256, timeout=0.5, cancel=cancel)
         except Exception:
             openp = []
-        
-        self.portscan_open = openp
-        self.portscan_cache[ip] = (openp, time.time())  # Cache results with timestamp
-        self._save_cache()  # Persist to disk
-        self.portscan_current_port = None
-        self.portscan_running = False
+        if not self._publish_portscan(cancel, openp):
+            # Superseded by a newer selection; its worker owns the panel now
+            return
+        deadline = time.monotonic() + self.cache_ttl
+        self.portscan_cache[ip] = (openp, deadline)  # Cache results until deadline
+        with self._cache_expiry_lock:
+            heapq.heappush(self._cache_expiry, (deadline, ip))
+        self._cache_dirty.set()  # persisted by _cache_flusher
+
+    def _publish_portscan(self, cancel: threading.Event, ports: List[int]) -> bool:
+        """Show a worker's result unless a newer scan has replaced it.
+
+        The cancel check and the state update happen under _portscan_lock,
+        the same lock _start_portscan resets the state under, so a stale
+        worker can never overwrite a newer scan's state.
+        """
+        with self._portscan_lock:
+            if cancel.is_set():
+                return False
+            self.portscan_open = ports
+            self.portscan_current_port = None
+            self.portscan_running = False
+            # in the same section, so no frame can see the scan finished
+            # without also seeing a change to draw
+            self._dirty = True
+        return True
 
     def _show_export_dialog(self, stdscr) -> None:
         """Show export dialog and handle exports in multiple formats."""
@@ -225,7 +547,7 @@ class TuiApp:
         except curses.error:
             self.export_message = "❌ Screen too small for export dialog"
             self.export_message_color = 2
-            self.export_message_time = time.time()
+            self.export_message_time = time.monotonic()
             return
         
         dialog.box()
@@ -277,10 +599,9 @@ class TuiApp:
                 dialog.addstr(9, 2, f" {check} Include DOWN hosts")
                 
                 # Stats
-                with self.scan_lock:
-                    total = len(self.scan_results)
-                    up_count = sum(1 for r in self.scan_results if r.get('up'))
-                    down_count = total - up_count
+                total = len(self._results_snapshot)
+                up_count = self._up_count
+                down_count = total - up_count
                 
                 dialog.addstr(11, 2, "Preview:", curses.A_BOLD)
                 if include_down:
@@ -296,7 +617,9 @@ class TuiApp:
             except curses.error:
                 pass
             
+            _sync_write(_SYNC_BEGIN)
             dialog.refresh()
+            _sync_write(_SYNC_END)
         
         # Dialog loop
         curses.curs_set(1)  # Show cursor
@@ -316,8 +639,7 @@ class TuiApp:
             elif ch in (10, 13, curses.KEY_ENTER):  # Enter - Export
                 # Perform export
                 try:
-                    with self.scan_lock:
-                        results = self.scan_results[:]
+                    results = self._results_snapshot
                     
                     # Convert to export format
                     hosts_dict = []
@@ -348,7 +670,7 @@ class TuiApp:
                     self.export_message = f"❌ Export failed: {str(e)[:40]}"
                     self.export_message_color = 2
                 
-                self.export_message_time = time.time()
+                self.export_message_time = time.monotonic()
                 break
             
             elif ch == 9:  # Tab - Switch format
@@ -387,7 +709,7 @@ class TuiApp:
                 cursor_pos += 1
         
         curses.curs_set(0)  # Hide cursor again
-        stdscr.nodelay(True)  # Back to non-blocking
+        stdscr.timeout(_INPUT_TIMEOUT_MS)  # Back to the main loop's timed wait
     
     def _show_profile_dialog(self, stdscr) -> None:
         """Show profile selection dialog."""
@@ -426,11 +748,23 @@ class TuiApp:
         except curses.error:
             self.export_message = "❌ Screen too small for profile dialog"
             self.export_message_color = 2
-            self.export_message_time = time.time()
+            self.export_message_time = time.monotonic()
             return
         
         dialog.box()
         dialog.keypad(True)
+
+        # Format each profile line once (without its selection marker)
+        # together with its unselected color; navigating only swaps the
+        # marker and the highlight
+        rendered = []
+        for name, profile, ptype in profile_list:
+            if ptype == 'predefined':
+                base_attr = curses.color_pair(2) if name == 'quick' else curses.color_pair(1)
+            else:
+                base_attr = curses.color_pair(3)
+            rendered.append((f" {name:<12} - {profile.description[:40]}"[:dialog_w-5], base_attr))
+        selected_attr = curses.A_BOLD | curses.color_pair(4)
         
         def refresh_dialog():
             dialog.erase()
@@ -453,23 +787,14 @@ class TuiApp:
                 end_idx = min(len(profile_list), start_idx + max_visible)
                 
                 for i in range(start_idx, end_idx):
-                    name, profile, ptype = profile_list[i]
+                    line, attr = rendered[i]
                     y = 3 + (i - start_idx)
                     
-                    # Selection marker
-                    marker = "●" if i == selected_idx else "○"
-                    
-                    # Color based on type and selection
+                    # Selection marker and highlight
                     if i == selected_idx:
-                        attr = curses.A_BOLD | curses.color_pair(4)
-                    elif ptype == 'predefined':
-                        attr = curses.color_pair(2) if name == 'quick' else curses.color_pair(1)
+                        dialog.addstr(y, 2, "●" + line, selected_attr)
                     else:
-                        attr = curses.color_pair(3)
-                    
-                    # Profile line
-                    profile_line = f"{marker} {name:<12} - {profile.description[:40]}"
-                    dialog.addstr(y, 2, profile_line[:dialog_w-4], attr)
+                        dialog.addstr(y, 2, "○" + line, attr)
                 
                 # Selected profile details
                 if profile_list:
@@ -487,7 +812,9 @@ class TuiApp:
             except curses.error:
                 pass
             
+            _sync_write(_SYNC_BEGIN)
             dialog.refresh()
+            _sync_write(_SYNC_END)
         
         # Dialog loop
         dialog.nodelay(False)  # Blocking mode
@@ -508,7 +835,7 @@ class TuiApp:
                     self.active_profile = profile
                     self.export_message = f"✅ Profile changed to: {name}"
                     self.export_message_color = 1
-                    self.export_message_time = time.time()
+                    self.export_message_time = time.monotonic()
                 break
             elif ch == curses.KEY_UP:
                 if selected_idx > 0:
@@ -521,13 +848,20 @@ class TuiApp:
             elif ch == curses.KEY_END:
                 selected_idx = len(profile_list) - 1
         
-        stdscr.nodelay(True)  # Back to non-blocking
+        stdscr.timeout(_INPUT_TIMEOUT_MS)  # Back to the main loop's timed wait
+
+    def _service_name(self, port: int) -> str:
+        name = self._svc_cache.get(port)
+        if name is None:
+            try:
+                name = socket.getservbyport(port, 'tcp')
+            except Exception:
+                name = _COMMON_SERVICES.get(port, 'unknown')
+            self._svc_cache[port] = name
+        return name
 
     def _open_detail_for_selected(self) -> None:
-        with self.scan_lock:
-            rows = self.scan_results[:]
-        if self.only_up:
-            rows = [r for r in rows if r.get('up')]
+        rows = self._view_rows
         if not rows:
             return
         idx = max(0, min(self.sel, len(rows) - 1))
@@ -535,39 +869,186 @@ class TuiApp:
         self.detail_active = True
         self.detail_ip = target_ip
         # kick off a port scan automatically
-        self.portscan_target = target_ip
-        self.portscan_open = []
-        self.portscan_running = True
-        threading.Thread(target=self._portscan_worker, args=(target_ip,), daemon=True).start()
+        self._start_portscan(target_ip)
+
+    def _lookup_ptrs(self, ips: List[str]) -> Dict[str, Optional[str]]:
+        """Reverse-resolve ips, querying only those not cached within _PTR_TTL."""
+        now = time.monotonic()
+        cache = self._ptr_cache
+        todo = [ip for ip in ips if ip not in cache or now - cache[ip][1] > _PTR_TTL]
+        if todo:
+            found = resolve_ptrs(todo)
+            for ip in todo:
+                cache[ip] = (found.get(ip) or None, now)
+        return {ip: cache[ip][0] for ip in ips}
+
+    def _row_index(self, ip: str) -> Optional[int]:
+        """Index of ip's row in scan_results; the caller holds scan_lock."""
+        idx = _ip_sort_key(ip) - self._ip_base
+        if 0 <= idx < self._prefilled and self.scan_results[idx]["ip"] == ip:
+            return idx
+        return self._ip_index.get(ip)
+
+    def _fill_names(self, ips: List[str]) -> None:
+        """Set hostname and MAC on stored rows from one PTR batch and the ARP map."""
+        ptr = self._lookup_ptrs(ips)
+        arp_map = self._arp_cache
+        with self.scan_lock:
+            for ip in ips:
+                idx = self._row_index(ip)
+                if idx is None:
+                    continue
+                host = ptr.get(ip)
+                mac = arp_map.get(ip) or None
+                row = {
+                    **self.scan_results[idx],
+                    "hostname": host, "mac": mac, "_hk": (host or "").lower(), "_mk": (mac or _NO_MAC_KEY).lower(),
+                }
+                row["_line"] = _row_line(row)
+                self.scan_results[idx] = row
+            self._results_snapshot = tuple(self.scan_results)
+            self._sort_dirty = True
+            self._dirty = True
 
     def _enrich_and_store(self, batch: List[dict]) -> None:
-        ips = [r["ip"] for r in batch]
-        ptr = resolve_ptrs(ips)
-        arp_map = get_arp_table()
+        # Names already known are shown right away; the rest arrive with
+        # the next _fill_names wave
+        ptr = self._ptr_cache
+        arp_map = self._arp_cache
         for r in batch:
-            r["hostname"] = ptr.get(r["ip"]) or None
+            known = ptr.get(r["ip"])
+            r["hostname"] = known[0] if known else None
             r["mac"] = arp_map.get(r["ip"]) or None
+            r["_hk"] = (r["hostname"] or "").lower()
+            r["_mk"] = (r["mac"] or _NO_MAC_KEY).lower()
+            lat = r.get("latency_ms")
+            r["_lk"] = float("inf") if lat is None else lat
+            r["_line"] = _row_line(r)
         # Merge into pre-filled list by IP
         with self.scan_lock:
             for r in batch:
                 ip = r["ip"]
-                idx = self._ip_index.get(ip)
-                if idx is not None and 0 <= idx < len(self.scan_results):
-                    # update fields
-                    self.scan_results[idx].update(r)
+                idx = self._row_index(ip)
+                if idx is not None:
+                    # replace the row with an updated copy
+                    row = self.scan_results[idx]
+                    self._up_count += bool(r.get("up")) - bool(row.get("up"))
+                    self.scan_results[idx] = {**row, **r}
                 else:
                     # if not pre-filled (range change), append
+                    r["_ipk"] = _ip_sort_key(ip)
                     self._ip_index[ip] = len(self.scan_results)
                     self.scan_results.append(r)
+                    self._up_count += bool(r.get("up"))
+            self._results_snapshot = tuple(self.scan_results)
+            self._sort_dirty = True
+            self._dirty = True
+
+    # Key handlers, dispatched through _keymap with the rows drawn this frame
+
+    def _key_quit(self, stdscr, rows: List[dict]) -> None:
+        self.stop = True
+        # Save pending cache changes before quitting
+        self._flush_cache()
+
+    def _key_scan(self, stdscr, rows: List[dict]) -> None:
+        if not self.scanning:
+            self.scanning = True
+            threading.Thread(target=self._scan, daemon=True).start()
+
+    def _key_export(self, stdscr, rows: List[dict]) -> None:
+        self._show_export_dialog(stdscr)
+
+    def _key_profile(self, stdscr, rows: List[dict]) -> None:
+        # Show profile selection dialog (Shift+P)
+        self._show_profile_dialog(stdscr)
+
+    def _key_clear_cache(self, stdscr, rows: List[dict]) -> None:
+        # Clear cache (Shift+C)
+        cache_count = len(self.portscan_cache)
+        self._clear_cache()
+        self.export_message = f"✓ Cleared {cache_count} cached entries"
+        self.export_message_color = 1
+        self.export_message_time = time.monotonic()
+
+    def _key_refresh(self, stdscr, rows: List[dict]) -> None:
+        # refresh detection
+        self.iface = get_default_interface() or self.iface
+        self.cidr = get_local_network_cidr() or self.cidr
+        # Also clear expired cache entries
+        self._clear_expired_cache()
+
+    def _key_filter(self, stdscr, rows: List[dict]) -> None:
+        self.only_up = not self.only_up
+        self._view_dirty = True
+        self.sel = 0
+
+    def _key_sort_next(self, stdscr, rows: List[dict]) -> None:
+        self.sort_by = _SORT_NEXT.get(self.sort_by, "ip")
+        self._sort_dirty = True
+
+    def _key_sort_order(self, stdscr, rows: List[dict]) -> None:
+        self.sort_desc = not self.sort_desc
+        self._sort_dirty = True
+
+    def _key_sort_column(self, col: str, stdscr, rows: List[dict]) -> None:
+        self.sort_by = col
+        self._sort_dirty = True
+
+    def _key_rescan_ports(self, stdscr, rows: List[dict]) -> None:
+        # Enter and 'p' re-scan ports for the selected row (the row on screen)
+        if rows:
+            target_ip = rows[max(0, min(self.sel, len(rows) - 1))]['ip']
+            if target_ip:
+                self._start_portscan(target_ip)
+
+    def _key_up(self, stdscr, rows: List[dict]) -> None:
+        if self.sel > 0:
+            self.sel -= 1
+            # follow the new selection, cancelling the previous scan
+            new_ip = rows[self.sel]['ip']
+            if new_ip and new_ip != self.portscan_target:
+                self._start_portscan(new_ip, delay=_PORTSCAN_DEBOUNCE)
+
+    def _key_down(self, stdscr, rows: List[dict]) -> None:
+        if self.sel < len(rows) - 1:
+            self.sel += 1
+            # follow the new selection, cancelling the previous scan
+            new_ip = rows[self.sel]['ip']
+            if new_ip and new_ip != self.portscan_target:
+                self._start_portscan(new_ip, delay=_PORTSCAN_DEBOUNCE)
+
+    def _handle_keys(self, stdscr, rows: List[dict]) -> None:
+        """Handle input after a frame.
+
+        The first key waits up to the input timeout; any that queued up
+        behind it are handled against the same rows until one re-sorts or
+        re-filters them.
+        """
+        try:
+            ch = stdscr.getch()
+        except Exception:
+            ch = -1
+        while ch != -1 and not self.stop:
+            self._dirty = True
+            handler = self._keymap.get(ch)
+            if handler is not None:
+                handler(stdscr, rows)
+            if self._sort_dirty or self._view_dirty:
+                break
+            stdscr.timeout(0)
+            try:
+                ch = stdscr.getch()
+            except Exception:
+                ch = -1
+            stdscr.timeout(_INPUT_TIMEOUT_MS)
 
     def draw(self, stdscr) -> None:
         curses.curs_set(0)
-        stdscr.nodelay(True)
-        stdscr.timeout(250)
-
-        # Launch background rate updater
-        t = threading.Thread(target=self._update_rates, daemon=True)
-        t.start()
+        threading.Thread(target=self._cache_flusher, daemon=True).start()
+        # getch blocks for at most this long, so the loop sleeps between
+        # frames instead of polling
+        stdscr.timeout(_INPUT_TIMEOUT_MS)
 
         # Colors
         use_colors = False
@@ -584,93 +1065,142 @@ class TuiApp:
             curses.init_pair(6, curses.COLOR_BLACK, curses.COLOR_YELLOW)  # selection highlight
             use_colors = True
 
-        def cpair(n):
-            return curses.color_pair(n) if use_colors else 0
-
-        def smooth(series: List[float], window: int = 4) -> List[float]:
-            if window <= 1 or len(series) <= 2:
-                return series[-width:] if 'width' in locals() else series
-            # simple moving average
-            w = min(window, len(series))
-            out: List[float] = []
-            acc = 0.0
-            q: List[float] = []
-            for v in series:
-                q.append(v)
-                acc += v
-                if len(q) > w:
-                    acc -= q.pop(0)
-                out.append(acc / len(q))
-            return out
-
-        def sparkline(series: List[float], width: int, smooth_window: int = 4) -> str:
-            # Simple 8-level sparkline using unicode blocks
+        # color_pair() attributes resolved once, indexed by pair number
+        pairs = tuple(curses.color_pair(n) if use_colors else 0 for n in range(8))
+        cpair = pairs.__getitem__
+
+        def safe_addstr(y: int, x: int, text: str, attr: int = 0) -> None:
+            # Clip to the current frame's h/w up front rather than letting
+            # curses raise for writes past the edge
+            n = w - x - 1
+            if 0 <= y < h and n > 0 and text:
+                try:
+                    stdscr.addnstr(y, x, text, n, attr)
+                except curses.error:
+                    pass  # double-width characters (emoji) overran the line
+
+        def sparkline(series: Deque[float], width: int) -> str:
+            # Simple 8-level sparkline using unicode blocks over the
+            # already-smoothed series
             if width <= 0:
                 return ""
             if not series:
                 return " " * width
             # Take last 'width' samples and normalize
-            data_src = series[-max(width, 20):]  # take a bit more for smoothing
-            data = smooth(data_src, smooth_window)[-width:]
+            data = list(_tail(series, width))
             maxv = max(data) or 1.0
-            blocks = "▁▂▃▄▅▆▇█"
-            out = []
-            for v in data[-width:]:
-                lvl = int(round((len(blocks) - 1) * (v / maxv)))
-                out.append(blocks[min(len(blocks) - 1, max(0, lvl))])
-            return "".join(out).ljust(width)
+            # rates are >= 0, so v * scale + 0.5 always lands in 0..7
+            scale = (len(_SPARK_BLOCKS) - 1) / maxv
+            return "".join([_SPARK_BLOCKS[int(v * scale + 0.5)] for v in data]).ljust(width)
+
+        # The graph lines only change with a new rate sample or a resize,
+        # so they are rebuilt only when (samples, width) moves on
+        graph_key = None
+        graph_lines = ("", "")
+
+        def build_graph_lines(w: int) -> Tuple[str, str]:
+            nonlocal graph_key, graph_lines
+            if graph_key != (self._rate_samples, w):
+                graph_key = (self._rate_samples, w)
+                # Build prettier graphs: labels + current + spark + max scale
+                # determine dynamic widths based on window
+                rx_label = f"RX {_fmt_rate(self.rx_rate)}  "
+                tx_label = f"TX {_fmt_rate(self.tx_rate)}  "
+                rx_max = max(_tail(self.rx_hist, 300), default=0.0)
+                tx_max = max(_tail(self.tx_hist, 300), default=0.0)
+                rx_right = f"  max {_fmt_rate(rx_max)}"
+                tx_right = f"  max {_fmt_rate(tx_max)}"
+                # compute spark width
+                rx_w = max(10, w - len(rx_label) - len(rx_right) - 1)
+                tx_w = max(10, w - len(tx_label) - len(tx_right) - 1)
+                rx_line = sparkline(self.rx_smooth, rx_w)
+                tx_line = sparkline(self.tx_smooth, tx_w)
+                graph_lines = (rx_label + rx_line + rx_right, tx_label + tx_line + tx_right)
+            return graph_lines
 
+        h, w = stdscr.getmaxyx()
         while not self.stop:
+            now = time.monotonic()
+            if now >= self._next_sample:
+                # Traffic is sampled about once a second; on an idle link the
+                # new sample usually leaves the graph (and the rates in the
+                # title, which match its labels) exactly as drawn
+                self._next_sample = now + 1.0
+                shown = graph_lines
+                self._sample_rates(now)
+                if build_graph_lines(w) != shown:
+                    self._dirty = True
+            ticking = self._ticking and now - self._last_render >= 1.0
+            if not (self._dirty or self.scanning or self.portscan_running or ticking):
+                # Nothing changed and no worker is running, so only a key can
+                # change the screen before the next sample (or timed
+                # element tick): sleep in getch until either, then render and
+                # hand the key to the handling below
+                wake = self._next_sample
+                if self._ticking:
+                    wake = min(wake, self._last_render + 1.0)
+                stdscr.timeout(max(1, int((wake - now) * 1000)))
+                try:
+                    ch = stdscr.getch()
+                except Exception:
+                    ch = -1
+                stdscr.timeout(_INPUT_TIMEOUT_MS)
+                if ch != -1:
+                    curses.ungetch(ch)
+                    self._dirty = True
+                continue
+            frame_wait = self._last_render + self._frame_interval - now
+            if frame_wait > 0:
+                # Over the frame budget (e.g. key repeat): keys queue up
+                # meanwhile and are all handled after the next render
+                time.sleep(frame_wait)
+                now = time.monotonic()
+            self._dirty = False
+            self._last_render = now
+            self._ticking = False
+            self._launch_pending_portscan(now)
+
             h, w = stdscr.getmaxyx()
             stdscr.erase()
 
             # Auto-start a scan once on first launch
             if not self.scanning and not self.auto_scan_started:
                 self.auto_scan_started = True
+                self.scanning = True
                 threading.Thread(target=self._scan, daemon=True).start()
 
-            # Top: Traffic
-            with self.rate_lock:
-                rx = self.rx_rate
-                tx = self.tx_rate
-            def fmt(bps: float) -> str:
-                units = ["B/s", "KB/s", "MB/s", "GB/s"]
-                i = 0
-                while bps >= 1024 and i < len(units)-1:
-                    bps /= 1024.0
-                    i += 1
-                return f"{bps:6.1f} {units[i]}"
-
-            title = f"netscan-tui  iface={self.iface}  net={self.cidr}  profile={self.active_profile.name}  rx={fmt(rx)}  tx={fmt(tx)}  filter={'UP' if self.only_up else 'ALL'}  sort={self.sort_by}{'↓' if self.sort_desc else '↑'}  cache={len(self.portscan_cache)}"
-            stdscr.addstr(0, 0, title[: max(0, w - 1)], curses.A_BOLD | cpair(4))
+            if h < _MIN_H or w < _MIN_W:
+                # Too small for the layout: show a hint instead of a frame of
+                # clipped writes, and keep handling keys on the last rows
+                if self._panel is not None:
+                    self._panel.hide()
+                    self._panel_win = None  # re-created and shown once it fits
+                safe_addstr(0, 0, f"Terminal too small ({w}x{h}), resize to {_MIN_W}x{_MIN_H}", curses.A_BOLD)
+                stdscr.noutrefresh()
+                curses.panel.update_panels()
+                _sync_write(_SYNC_BEGIN)
+                try:
+                    curses.doupdate()
+                except Exception:
+                    stdscr.refresh()
+                _sync_write(_SYNC_END)
+                self._handle_keys(stdscr, self._view_rows)
+                continue
+
+            # Top: title with the current traffic rates
+            rx = self.rx_rate
+            tx = self.tx_rate
+            title = f"netscan-tui  iface={self.iface}  net={self.cidr}  profile={self.active_profile.name}  rx={_fmt_rate(rx)}  tx={_fmt_rate(tx)}  filter={'UP' if self.only_up else 'ALL'}  sort={self.sort_by}{'↓' if self.sort_desc else '↑'}  cache={len(self.portscan_cache)}"
+            safe_addstr(0, 0, title, curses.A_BOLD | cpair(4))
 
             # Help line
             help_line = "[s]can  [r]efresh  [P]rofile  [a]ctive-only  [e]xport  [C]lear cache  [1-5] sort  [o]cycle  [O]asc/desc  [p]orts  ↑/↓ select  [q]uit"
-            stdscr.addstr(1, 0, help_line[: max(0, w - 1)], curses.A_DIM | cpair(4))
-
-            # Graph lines: RX and TX sparklines
-            # Build prettier graphs: labels + current + spark + max scale
-            # determine dynamic widths based on window
-            rx_label = f"RX {fmt(rx)}  "
-            tx_label = f"TX {fmt(tx)}  "
-            with self.rate_lock:
-                rx_max = max(self.rx_hist[-300:] or [0.0])
-                tx_max = max(self.tx_hist[-300:] or [0.0])
-            rx_right = f"  max {fmt(rx_max)}"
-            tx_right = f"  max {fmt(tx_max)}"
-            # compute spark width
-            rx_prefix_len = len(rx_label)
-            tx_prefix_len = len(tx_label)
-            rx_suffix_len = len(rx_right)
-            tx_suffix_len = len(tx_right)
-            rx_w = max(10, w - rx_prefix_len - rx_suffix_len - 1)
-            tx_w = max(10, w - tx_prefix_len - tx_suffix_len - 1)
-            with self.rate_lock:
-                rx_line = sparkline(self.rx_hist, rx_w)
-                tx_line = sparkline(self.tx_hist, tx_w)
-            # RX line in magenta, TX in blue
-            stdscr.addstr(2, 0, (rx_label + rx_line + rx_right)[: max(0, w - 1)], cpair(5))
-            stdscr.addstr(3, 0, (tx_label + tx_line + tx_right)[: max(0, w - 1)], cpair(7))
+            safe_addstr(1, 0, help_line, curses.A_DIM | cpair(4))
+
+            # Graph lines: RX and TX sparklines, RX in magenta, TX in blue
+            rx_graph, tx_graph = build_graph_lines(w)
+            safe_addstr(2, 0, rx_graph, cpair(5))
+            safe_addstr(3, 0, tx_graph, cpair(7))
 
             # Determine LEFT-side details panel geometry (always visible)
             panel_active = True
@@ -689,9 +1219,8 @@ class TuiApp:
             # Scan area header (for right side)
             header_y = 5
             table_x = panel_w + 1  # Start table after panel
-            with self.scan_lock:
-                progress = len(self.scan_results)
-                up_count = sum(1 for r in self.scan_results if r.get('up'))
+            snapshot = self._results_snapshot
+            progress = len(snapshot)
             
             # Show scan status with current host
             if self.scanning and self.scan_current_host:
@@ -701,7 +1230,7 @@ class TuiApp:
             else:
                 state = 'idle'
             
-            stdscr.addstr(header_y, table_x, f"Scan results ({state})  hosts={progress}", curses.A_BOLD)
+            safe_addstr(header_y, table_x, f"Scan results ({state})  hosts={progress}", curses.A_BOLD)
             # Header with sort indicators at fixed columns (relative to table_x)
             col_ip = table_x
             col_status = table_x + 17
@@ -717,49 +1246,44 @@ class TuiApp:
                 f"{col_title('Latency', 'latency'):<8}  "
                 f"{col_title('Hostname', 'hostname'):<20}  "
             )
-            stdscr.addstr(header_y + 1, table_x, header_line[: max(0, w - table_x - 1)], curses.A_UNDERLINE)
+            safe_addstr(header_y + 1, table_x, header_line, curses.A_UNDERLINE)
 
             # Print results
-            with self.scan_lock:
-                rows = self.scan_results[:]
-            # filter
-            if self.only_up:
-                rows = [r for r in rows if r.get("up")]
-            # sorting
-            def ip_key(ip: str) -> tuple:
-                try:
-                    return tuple(int(p) for p in ip.split("."))
-                except Exception:
-                    return (999, 999, 999, 999)
-            def sort_key(r: dict):
-                k = self.sort_by
-                if k == "ip":
-                    return ip_key(r.get("ip", "255.255.255.255"))
-                if k == "status":
-                    # up first when descending=False => invert bool accordingly
-                    return (0 if r.get("up") else 1)
-                if k == "latency":
-                    lat = r.get("latency_ms")
-                    return (float("inf") if lat is None else lat)
-                if k == "hostname":
-                    return (r.get("hostname") or "").lower()
-                if k == "mac":
-                    return (r.get("mac") or "zz:zz:zz:zz:zz:zz").lower()
-                return ip_key(r.get("ip", "255.255.255.255"))
-            rows.sort(key=sort_key, reverse=self.sort_desc)
+            keep_ip: Optional[str] = None
+            if self._sort_dirty:
+                # clear first so an update landing mid-sort re-dirties it
+                self._sort_dirty = False
+                if 0 <= self.sel < len(self._view_rows):
+                    keep_ip = self._view_rows[self.sel]["ip"]
+                # status sorts up first when ascending
+                key = _SORT_KEYS.get(self.sort_by, _SORT_KEYS["ip"])
+                self._sorted_rows = sorted(snapshot, key=key, reverse=self.sort_desc)
+                self._view_dirty = True
+            if self._view_dirty:
+                if self.only_up:
+                    self._view_rows = [r for r in self._sorted_rows if r.get("up")]
+                else:
+                    self._view_rows = self._sorted_rows
+                self._view_dirty = False
+            rows = self._view_rows
+            if keep_ip is not None:
+                # a re-sort moves rows, not the selection: stay on the host
+                for i, r in enumerate(rows):
+                    if r["ip"] == keep_ip:
+                        self.sel = i
+                        break
             # ensure selection bounds
             if rows:
                 self.sel = max(0, min(self.sel, len(rows) - 1))
             else:
                 self.sel = 0
 
-            # Selected IP for right panel and auto-follow port scan when idle
+            # Selected IP for right panel; the port scan follows the selection
+            # when it lands on another host (first frame, filter toggle, the
+            # selected host dropping out of the view)
             selected_ip: Optional[str] = rows[self.sel]['ip'] if rows else None
-            if selected_ip and selected_ip != self.portscan_target and not self.portscan_running:
-                self.portscan_target = selected_ip
-                self.portscan_open = []
-                self.portscan_running = True
-                threading.Thread(target=self._portscan_worker, args=(selected_ip,), daemon=True).start()
+            if selected_ip and selected_ip != self.portscan_target:
+                self._start_portscan(selected_ip, delay=_PORTSCAN_DEBOUNCE)
 
             start_y = header_y + 2
             max_rows = max(0, h - start_y - 2)
@@ -768,31 +1292,26 @@ class TuiApp:
             if self.sel >= max_rows:
                 top_index = self.sel - max_rows + 1
 
-            for i, r in enumerate(rows[top_index : top_index + max_rows]):
+            end_index = min(len(rows), top_index + max_rows)
+            # colorize ip/status; the selected row is highlighted
+            ip_col, up_col, down_col = pairs[3], pairs[1], pairs[2]
+            sel_attrs = curses.A_REVERSE | pairs[6]
+            # loop-invariant lookups bound once per frame
+            chgat = stdscr.chgat
+            sel = self.sel
+            ip_fits = col_ip < w - 1
+            status_fits = col_status < w - 1
+            for i in range(end_index - top_index):
+                r = rows[top_index + i]
                 y = start_y + i
-                status_up = bool(r.get("up"))
-                status = "UP" if status_up else "DOWN"
-                lat = r.get("latency_ms")
-                lat_s = f"{lat:.2f} ms" if lat is not None else "-"
-                host = (r.get("hostname") or "-")[:20]
-                line = f"{r['ip']:<15}  {status:<6}  {lat_s:<8}  {host:<20}"
-                attrs = 0
-                # colorize ip/status
-                ip_col = cpair(3)
-                st_col = cpair(1) if status_up else cpair(2)
-                # selection highlight
-                if top_index + i == self.sel:
-                    attrs |= curses.A_REVERSE | cpair(6)
-                # print with simple segmentation to colorize parts
-                try:
-                    stdscr.addstr(y, table_x, f"{r['ip']:<15}", ip_col | attrs)
-                    stdscr.addstr(y, table_x + 17, f"{status:<6}", st_col | attrs)
-                    stdscr.addstr(y, table_x + 26, f"{lat_s:<8}", attrs)
-                    stdscr.addstr(y, table_x + 37, f"{host:<20}", attrs)
-                except curses.error:
-                    # If window too small, fallback to single write
-                    content_w = max(0, w - table_x - 1)
-                    stdscr.addstr(y, table_x, line[: content_w], attrs)
+                attrs = sel_attrs if top_index + i == sel else 0
+                # write the row once, then recolor the ip/status cells in
+                # place (chgat clips its length at the right edge)
+                safe_addstr(y, table_x, r["_line"], attrs)
+                if ip_fits:
+                    chgat(y, col_ip, 15, ip_col | attrs)
+                if status_fits:
+                    chgat(y, col_status, 6, (up_col if r.get("up") else down_col) | attrs)
 
             # Portscan status is shown in the left panel; no bottom panel
 
@@ -814,9 +1333,19 @@ class TuiApp:
                 except curses.error:
                     pass
                 
-                # Create and draw the panel window
+                # Draw the panel window, reusing it until the layout changes
                 try:
-                    win = curses.newwin(panel_h, panel_w, y0, x0)
+                    geom = (panel_h, panel_w, y0, x0)
+                    if self._panel_win is None or geom != self._panel_geom:
+                        self._panel_win = curses.newwin(*geom)
+                        self._panel_geom = geom
+                        if self._panel is None:
+                            self._panel = curses.panel.new_panel(self._panel_win)
+                        else:
+                            self._panel.replace(self._panel_win)
+                        self._panel.show()
+                    win = self._panel_win
+                    win.erase()
                     win.box()
                     inner_w = max(10, panel_w - 2)
                     row = 1
@@ -826,18 +1355,17 @@ class TuiApp:
                         if row >= panel_h - 1:
                             return
                         try:
-                            display_line = line[:inner_w] if len(line) > inner_w else line
-                            win.addstr(row, 1, display_line.ljust(inner_w), attr)
+                            win.addnstr(row, 1, line.ljust(inner_w), inner_w, attr)
                         except curses.error:
                             pass
                         row += 1
                 except Exception as e:
                     # If panel creation fails, show error on main screen
-                    try:
-                        err_msg = f"Panel ERR: {type(e).__name__} {str(e)[:20]}"
-                        stdscr.addstr(header_y + 1, 0, err_msg, curses.A_DIM)
-                    except:
-                        pass
+                    self._panel_win = None
+                    if self._panel is not None:
+                        self._panel.hide()
+                    err_msg = f"Panel ERR: {type(e).__name__} {str(e)[:20]}"
+                    safe_addstr(header_y + 1, 0, err_msg, curses.A_DIM)
                 else:
 
                     # Title
@@ -847,14 +1375,9 @@ class TuiApp:
                     except curses.error:
                         pass
 
-                    # Info for selected IP
-                    info = None
+                    # Info for selected IP (the selected row itself)
+                    info = rows[self.sel] if rows else None
                     target_ip = selected_ip
-                    with self.scan_lock:
-                        for r in self.scan_results:
-                            if r.get('ip') == target_ip:
-                                info = r
-                                break
                     if info:
                         status_up = bool(info.get('up'))
                         status = "UP" if status_up else "DOWN"
@@ -883,10 +1406,9 @@ class TuiApp:
                         put(f"│ Latency:", curses.A_BOLD)
                         put(f"│   {lat_s}")
                         put("│")
-                        put("└" + "─" * (inner_w - 1))
+                        put(_panel_rule("└", "─", inner_w))
                         put("")
                         put("┌─ Open TCP Ports", curses.A_BOLD | cpair(4))
-                        put("┌─ Open TCP Ports", curses.A_BOLD | cpair(4))
                     else:
                         put("")
                         put("┌─ Network Information", curses.A_BOLD | cpair(4))
@@ -903,7 +1425,7 @@ class TuiApp:
                         put(f"│ Status:", curses.A_BOLD)
                         put("│   Unknown", curses.A_DIM)
                         put("│")
-                        put("└" + "─" * (inner_w - 1))
+                        put(_panel_rule("└", "─", inner_w))
                         put("")
                         put("Press 's' to start network scan", curses.A_DIM)
                         put("")
@@ -918,8 +1440,8 @@ class TuiApp:
                             put("│ ⟳ Scanning ports...", curses.A_DIM | cpair(4))
                     elif self.portscan_target in self.portscan_cache:
                         # Show cache age
-                        _, ts = self.portscan_cache[self.portscan_target]
-                        age = time.time() - ts
+                        _, deadline = self.portscan_cache[self.portscan_target]
+                        age = self.cache_ttl - (deadline - time.monotonic())
                         if age < 60:
                             age_str = f"{int(age)}s ago"
                         elif age < 3600:
@@ -927,24 +1449,12 @@ class TuiApp:
                         else:
                             age_str = f"{int(age/3600)}h ago"
                         put(f"│ ✓ Cached ({age_str})", curses.A_DIM | cpair(1))
+                        self._ticking = True
                     else:
-                        def svc(p: int) -> str:
-                            try:
-                                return socket.getservbyport(p, 'tcp')
-                            except Exception:
-                                # common fallbacks
-                                common = {
-                                    21: 'ftp', 22: 'ssh', 23: 'telnet', 25: 'smtp',
-                                    53: 'domain', 80: 'http', 110: 'pop3', 143: 'imap',
-                                    443: 'https', 445: 'smb', 3306: 'mysql', 3389: 'rdp',
-                                    5432: 'postgresql', 5900: 'vnc', 6379: 'redis',
-                                    8080: 'http-proxy', 8443: 'https-alt', 27017: 'mongodb'
-                                }
-                                return common.get(p, 'unknown')
                         shown = 0
                         if self.portscan_open:
                             for p in self.portscan_open:
-                                service = svc(p)
+                                service = self._service_name(p)
                                 put(f"│ • {p:>5}/tcp  →  {service}", cpair(1))
                                 shown += 1
                                 if row >= panel_h - 3:
@@ -955,7 +1465,7 @@ class TuiApp:
                         else:
                             put("│ No open ports found", curses.A_DIM)
                     put("│")
-                    put("└" + "─" * (inner_w - 1))
+                    put(_panel_rule("└", "─", inner_w))
                     put("")
                     put("╔═══ CONTROLS ═══", curses.A_BOLD | cpair(4))
                     put("║")
@@ -967,144 +1477,61 @@ class TuiApp:
                     put("║ [1-5]    Sort by column", curses.A_DIM)
                     put("║ [o]      Cycle sort", curses.A_DIM)
                     put("║ [q]      Quit", curses.A_DIM)
-                    put("╚" + "═" * (inner_w - 1))
+                    put(_panel_rule("╚", "═", inner_w))
                     # Don't refresh panel yet - wait until after stdscr
 
             # Footer with export message or last scan time
             if self.export_message and self.export_message_time:
                 # Show export message for 5 seconds
-                if time.time() - self.export_message_time < 5.0:
-                    try:
-                        msg_color = cpair(self.export_message_color)
-                        stdscr.addstr(h - 1, 0, self.export_message[:w-1], msg_color | curses.A_BOLD)
-                    except curses.error:
-                        pass
+                if now - self.export_message_time < 5.0:
+                    msg_color = cpair(self.export_message_color)
+                    safe_addstr(h - 1, 0, self.export_message, msg_color | curses.A_BOLD)
+                    self._ticking = True  # until the message expires
                 else:
                     self.export_message = None
             elif self.last_scan_ts:
-                stdscr.addstr(h - 1, 0, time.strftime("Last scan: %Y-%m-%d %H:%M:%S", time.localtime(self.last_scan_ts)), curses.A_DIM)
+                if self.last_scan_ts != self._last_scan_ts_rendered:
+                    self._last_scan_str = time.strftime("Last scan: %Y-%m-%d %H:%M:%S", time.localtime(self.last_scan_ts))
+                    self._last_scan_ts_rendered = self.last_scan_ts
+                safe_addstr(h - 1, 0, self._last_scan_str, curses.A_DIM)
 
-            # Batch refresh: stdscr first, then panel on top
+            # Batch refresh: stdscr first, then the panel stack on top
             stdscr.noutrefresh()
-            if panel_active and 'win' in locals():
-                try:
-                    win.noutrefresh()
-                except:
-                    pass
+            curses.panel.update_panels()
+            _sync_write(_SYNC_BEGIN)
             try:
                 curses.doupdate()
             except Exception:
                 stdscr.refresh()
+            _sync_write(_SYNC_END)
 
-            # Handle keys
-            try:
-                ch = stdscr.getch()
-            except Exception:
-                ch = -1
-
-            if ch == ord('q'):
-                self.stop = True
-                # Save cache before quitting
-                self._save_cache()
-                break
-            elif ch == ord('s') and not self.scanning:
-                threading.Thread(target=self._scan, daemon=True).start()
-            elif ch == ord('e'):
-                # Show export dialog
-                self._show_export_dialog(stdscr)
-            elif ch == ord('P'):
-                # Show profile selection dialog (Shift+P)
-                self._show_profile_dialog(stdscr)
-            elif ch == ord('C'):
-                # Clear cache (Shift+C)
-                cache_count = len(self.portscan_cache)
-                self._clear_cache()
-                self.export_message = f"✓ Cleared {cache_count} cached entries"
-                self.export_message_color = 1
-                self.export_message_time = time.time()
-            elif ch == ord('r'):
-                # refresh detection
-                self.iface = get_default_interface() or self.iface
-                self.cidr = get_local_network_cidr() or self.cidr
-                # Also clear expired cache entries
-                self._clear_expired_cache()
-            elif ch == ord('a'):
-                self.only_up = not self.only_up
-                self.sel = 0
-            elif ch == ord('o'):
-                # cycle sort column
-                order = ["ip", "status", "latency", "hostname", "mac"]
-                try:
-                    idx = (order.index(self.sort_by) + 1) % len(order)
-                except ValueError:
-                    idx = 0
-                self.sort_by = order[idx]
-            elif ch == ord('O'):
-                self.sort_desc = not self.sort_desc
-            elif ch in (ord('1'), ord('2'), ord('3'), ord('4'), ord('5')):
-                mapping = {
-                    ord('1'): "ip",
-                    ord('2'): "status",
-                    ord('3'): "latency",
-                    ord('4'): "hostname",
-                    ord('5'): "mac",
-                }
-                self.sort_by = mapping.get(ch, self.sort_by)
-            elif ch in (10, 13, curses.KEY_ENTER):  # Enter re-scans ports for selected
-                if rows:
-                    target_ip = rows[self.sel]['ip']
-                    if target_ip:
-                        self.portscan_target = target_ip
-                        self.portscan_open = []
-                        self.portscan_running = True
-                        threading.Thread(target=self._portscan_worker, args=(target_ip,), daemon=True).start()
-            elif ch == ord('p'):
-                # scan top 1000 ports for selected host
-                with self.scan_lock:
-                    rows = self.scan_results[:]
-                if self.only_up:
-                    rows = [r for r in rows if r.get('up')]
-                if not rows:
-                    continue
-                idx = max(0, min(self.sel, len(rows) - 1))
-                target_ip = rows[idx]['ip']
-                if target_ip:
-                    self.portscan_target = target_ip
-                    self.portscan_open = []
-                    self.portscan_running = True
-                    threading.Thread(target=self._portscan_worker, args=(target_ip,), daemon=True).start()
-
-            elif ch in (curses.KEY_UP, ord('k')):
-                if self.sel > 0:
-                    self.sel -= 1
-                    # auto-trigger scan for new selection if idle
-                    if not self.portscan_running and rows:
-                        new_ip = rows[self.sel]['ip']
-                        if new_ip and new_ip != self.portscan_target:
-                            self.portscan_target = new_ip
-                            self.portscan_open = []
-                            self.portscan_running = True
-                            threading.Thread(target=self._portscan_worker, args=(new_ip,), daemon=True).start()
-            elif ch in (curses.KEY_DOWN, ord('j')):
-                with self.scan_lock:
-                    n = len([r for r in self.scan_results if (r.get('up') if self.only_up else True)])
-                if self.sel < max(0, n - 1):
-                    self.sel += 1
-                    # auto-trigger scan for new selection if idle
-                    if not self.portscan_running and rows:
-                        new_ip = rows[self.sel]['ip']
-                        if new_ip and new_ip != self.portscan_target:
-                            self.portscan_target = new_ip
-                            self.portscan_open = []
-                            self.portscan_running = True
-                            threading.Thread(target=self._portscan_worker, args=(new_ip,), daemon=True).start()
+            self._handle_keys(stdscr, rows)
 
         # end loop
 
 
-def main() -> int:
-    app = TuiApp()
-    curses.wrapper(app.draw)
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="netscan-tui",
+        description="Interactive terminal UI for netscan.",
+    )
+    parser.add_argument(
+        "--max-fps",
+        type=float,
+        default=30.0,
+        help="Upper bound on screen redraws per second (default: 30, 0 = unlimited)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None) -> int:
+    ns = parse_args(argv if argv is not None else sys.argv[1:])
+    app = TuiApp(max_fps=ns.max_fps)
+    try:
+        curses.wrapper(app.draw)
+    finally:
+        # e.g. Ctrl-C: keep results the flusher has not written yet
+        app._flush_cache()
     return 0
 
 
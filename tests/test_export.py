@@ -5,6 +5,7 @@ Tests for export module.
 import unittest
 import tempfile
 import csv
+import gzip
 from pathlib import Path
 
 from netscan.export import CSVExporter, MarkdownExporter, HTMLExporter, HostData, export_to_csv, export_to_markdown, export_to_html
@@ -161,6 +162,31 @@ class TestCSVExporter(unittest.TestCase):
             content = f.read()
             self.assertIn("Company, Inc.", content)
     
+    def test_quoting_matches_csv_module(self):
+        """Test that quoted fields round-trip through the csv reader."""
+        output = Path(self.temp_dir) / "quoting.csv"
+        exporter = CSVExporter(str(output))
+        
+        hosts = [
+            HostData(
+                ip="192.168.1.1",
+                status="UP",
+                hostname='odd"name,host',
+                vendor='Vendor "X"\nLine 2',
+                ports=[22, 80]
+            ),
+            HostData(ip="192.168.1.2", status="UP", hostname="plain", vendor="Plain"),
+        ]
+        exporter.export(hosts)
+        
+        with open(output, 'r', newline='') as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[1][3], 'odd"name,host')
+        self.assertEqual(rows[1][5], 'Vendor "X"\nLine 2')
+        self.assertEqual(rows[1][6], "22, 80")
+        self.assertEqual(rows[2], ["192.168.1.2", "UP", "", "plain", "", "Plain", ""])
+    
     def test_convenience_function(self):
         """Test export_to_csv convenience function."""
         output = Path(self.temp_dir) / "convenience.csv"
@@ -185,6 +211,24 @@ class TestCSVExporter(unittest.TestCase):
             rows = list(reader)
             self.assertEqual(len(rows), 1)
             self.assertEqual(rows[0]['IP Address'], '192.168.1.1')
+    
+    def test_export_compressed(self):
+        """Test gzip-compressed CSV export."""
+        output = Path(self.temp_dir) / "compressed.csv.gz"
+        exporter = CSVExporter(str(output), compress=True)
+        
+        hosts = [
+            HostData(ip="192.168.1.1", status="UP", latency=1.0, vendor="Company, Inc.", ports=[22, 80]),
+            HostData(ip="192.168.1.2", status="UP", latency=2.0),
+        ]
+        exporter.export(hosts)
+        
+        with gzip.open(output, 'rt', newline='') as f:
+            reader = csv.DictReader(f)
+            rows = list(reader)
+            self.assertEqual(len(rows), 2)
+            self.assertEqual(rows[0]['Vendor'], "Company, Inc.")
+            self.assertEqual(rows[0]['Open Ports'], "22, 80")
 
 
 class TestPortRangeFormatting(unittest.TestCase):
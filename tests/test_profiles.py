@@ -294,6 +294,8 @@ class TestPortRange(unittest.TestCase):
         self.assertEqual(len(ports), 1000)
         self.assertEqual(ports[0], 1)
         self.assertEqual(ports[-1], 1000)
+        # Shared module-level sequence must not be mutable by callers
+        self.assertIsInstance(ports, tuple)
     
     def test_numeric_range(self):
         """Test numeric port range."""
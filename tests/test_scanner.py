@@ -0,0 +1,133 @@
+"""
+Unit tests for scanner helpers.
+"""
+
+import ipaddress
+import threading
+import time
+import types
+import unittest
+from unittest import mock
+from netscan import scanner
+from netscan.scanner import expand_targets, port_scan, _parse_ping_latency, PingResult
+
+
+class TestExpandTargets(unittest.TestCase):
+    """Test expand_targets function."""
+
+    def test_is_lazy(self):
+        """Test that targets are produced by a generator."""
+        self.assertIsInstance(expand_targets('10.0.0.0/8'), types.GeneratorType)
+
+    def test_cidr_matches_ipaddress(self):
+        """Test CIDR expansion against ipaddress.hosts()."""
+        for cidr in ('192.168.1.0/24', '10.0.0.0/30', '10.0.0.4/31', '172.16.0.0/20'):
+            expected = [str(h) for h in ipaddress.ip_network(cidr).hosts()]
+            self.assertEqual(list(expand_targets(cidr)), expected, cidr)
+
+    def test_single_ip(self):
+        """Test single address and /32 targets."""
+        self.assertEqual(list(expand_targets('192.168.1.7')), ['192.168.1.7'])
+        self.assertEqual(list(expand_targets('192.168.1.7/32')), ['192.168.1.7'])
+
+    def test_range_last_octet(self):
+        """Test a.b.c.d-e range form."""
+        self.assertEqual(
+            list(expand_targets('192.168.1.254-2')),
+            ['192.168.1.2', '192.168.1.3'] + [f'192.168.1.{i}' for i in range(4, 255)]
+        )
+
+    def test_range_full(self):
+        """Test a.b.c.d-a.b.c.e range form across an octet boundary."""
+        self.assertEqual(
+            list(expand_targets('10.0.0.255-10.0.1.1')),
+            ['10.0.0.255', '10.0.1.0', '10.0.1.1']
+        )
+
+    def test_ipv6(self):
+        """Test IPv6 networks still expand."""
+        self.assertEqual(list(expand_targets('fd00::/126')), ['fd00::1', 'fd00::2', 'fd00::3'])
+
+    def test_invalid(self):
+        """Test malformed targets raise ValueError."""
+        with self.assertRaises(ValueError):
+            list(expand_targets('not-an-ip'))
+
+
+class TestParsePingLatency(unittest.TestCase):
+    """Test _parse_ping_latency function."""
+
+    def test_linux_summary(self):
+        """Test Linux ping -q summary line."""
+        out = (
+            "PING 10.0.0.1 (10.0.0.1) 56(84) bytes of data.\n\n"
+            "--- 10.0.0.1 ping statistics ---\n"
+            "2 packets transmitted, 2 received, 0% packet loss, time 1001ms\n"
+            "rtt min/avg/max/mdev = 0.041/0.052/0.063/0.011 ms\n"
+        )
+        self.assertAlmostEqual(_parse_ping_latency(out), 0.052)
+
+    def test_bsd_summary(self):
+        """Test macOS ping -q summary line."""
+        out = (
+            "PING 10.0.0.1 (10.0.0.1): 56 data bytes\n\n"
+            "--- 10.0.0.1 ping statistics ---\n"
+            "1 packets transmitted, 1 packets received, 0.0% packet loss\n"
+            "round-trip min/avg/max/stddev = 14.654/14.654/14.654/0.000 ms\n"
+        )
+        self.assertAlmostEqual(_parse_ping_latency(out), 14.654)
+
+    def test_reply_line_fallback(self):
+        """Test a non-quiet reply line is still understood."""
+        out = "64 bytes from 10.0.0.1: icmp_seq=1 ttl=64 time=0.23 ms\n"
+        self.assertAlmostEqual(_parse_ping_latency(out), 0.23)
+
+    def test_no_reply(self):
+        """Test output without replies yields None."""
+        out = (
+            "PING 10.0.0.9 (10.0.0.9): 56 data bytes\n\n"
+            "--- 10.0.0.9 ping statistics ---\n"
+            "1 packets transmitted, 0 packets received, 100.0% packet loss\n"
+        )
+        self.assertIsNone(_parse_ping_latency(out))
+
+
+class TestPortScanCancel(unittest.TestCase):
+    """Test port_scan cancellation."""
+
+    def test_cancelled_scan_returns_early(self):
+        """Test a set cancel event stops the scan before probing."""
+        cancel = threading.Event()
+        cancel.set()
+        start = time.monotonic()
+        self.assertEqual(port_scan('192.0.2.1', range(1, 1025), timeout=2.0, cancel=cancel), [])
+        self.assertLess(time.monotonic() - start, 1.0)
+
+
+class TestTcpFallback(unittest.TestCase):
+    """Test _with_tcp_fallback concurrency bound."""
+
+    def test_probes_respect_workers(self):
+        """Test no more than workers TCP probes run at once."""
+        lock = threading.Lock()
+        running = [0, 0]  # current, peak
+
+        def probe(ip):
+            with lock:
+                running[0] += 1
+                running[1] = max(running[1], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+            return 1.0 if ip.endswith('.3') else None
+
+        results = [PingResult(ip=f'10.0.0.{i}', up=False, latency_ms=None) for i in range(1, 15)]
+        with mock.patch.object(scanner, '_tcp_probe', probe):
+            out = list(scanner._with_tcp_fallback(results, True, 2))
+        self.assertLessEqual(running[1], 2)
+        self.assertEqual(len(out), 14)
+        self.assertEqual([r['ip'] for r in out if r['up']], ['10.0.0.3'])
+
+
+if __name__ == '__main__':
+    unittest.main()
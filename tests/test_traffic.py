@@ -0,0 +1,41 @@
+"""
+Unit tests for interface traffic counters.
+"""
+
+import struct
+import unittest
+from netscan.traffic import _parse_iflist2
+
+
+def _ifmsg(name, ibytes, obytes, msgtype=0x12):
+    """Build one if_msghdr2 + sockaddr_dl record as returned by NET_RT_IFLIST2."""
+    hdr = bytearray(160)
+    sdl = bytearray(8) + name.encode() + bytearray(6)
+    sdl[5] = len(name)
+    msg = hdr + sdl
+    msg += bytearray(-len(msg) % 4)
+    struct.pack_into('=HBB', msg, 0, len(msg), 5, msgtype)
+    struct.pack_into('=QQ', msg, 96, ibytes, obytes)
+    return bytes(msg)
+
+
+class TestParseIflist2(unittest.TestCase):
+    """Test _parse_iflist2 function."""
+
+    def test_parse(self):
+        """Test counters are read per interface name."""
+        buf = _ifmsg('lo0', 10, 20) + _ifmsg('en0', 2**40, 7)
+        self.assertEqual(_parse_iflist2(buf), {'lo0': (10, 20), 'en0': (2**40, 7)})
+
+    def test_skips_other_messages(self):
+        """Test non-RTM_IFINFO2 messages are ignored."""
+        buf = _ifmsg('en0', 1, 2, msgtype=0x13) + _ifmsg('en1', 3, 4)
+        self.assertEqual(_parse_iflist2(buf), {'en1': (3, 4)})
+
+    def test_empty(self):
+        """Test an empty dump."""
+        self.assertEqual(_parse_iflist2(b''), {})
+
+
+if __name__ == '__main__':
+    unittest.main()